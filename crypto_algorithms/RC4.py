@@ -0,0 +1,189 @@
+def KSA(key):
+    key_length = len(key) #save la longeur de la clé
+    S = list(range(256)) #initialize a list of 256 values
+    j = 0
+    
+    for i in range(256):
+        j = (j + S[i] + key[i % key_length])%256 #calculer la nouvelle valeur de j
+        S[i], S[j] = S[j], S[i] #swap the two values
+    
+    return S
+
+def PRGA(S,data_length):
+    i = 0
+    j = 0
+    keystream = []
+    
+    for _ in range(data_length):
+        i = (i +1)%256
+        j = (j + S[i])%256
+        S[i], S[j] = S[j], S[i]
+        sum = (S[i]+ S[j])%256
+        keystream.append(S[sum] )
+    
+    return keystream
+
+def _as_buffer(data):
+    # n'importe quel objet qui supporte le buffer protocol, vu comme des octets sans copie
+    if isinstance(data, str):
+        return data.encode()
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return bytes(data)  # ancienne entree: une sequence d'entiers
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return view
+
+
+def _xor(data, keystream):
+    # xor de tout le bloc d'un coup au lieu d'un append par octet
+    n = len(data)
+    x = int.from_bytes(data, 'little') ^ int.from_bytes(keystream, 'little')
+    return bytearray(x.to_bytes(n, 'little'))
+
+
+class RC4Stream:
+    """Stateful RC4 cipher: the key schedule runs once and update() continues the keystream."""
+
+    def __init__(self, key):
+        self.S = KSA(_as_buffer(key))
+        self.i = 0
+        self.j = 0
+
+    def keystream(self, length):
+        """Return the next `length` keystream bytes and advance the state."""
+        out = bytearray(length)
+        self.keystream_into(out, length)
+        return out
+
+    def keystream_into(self, out, length):
+        """Write the next `length` keystream bytes into the start of `out`."""
+        S = self.S
+        i = self.i
+        j = self.j
+
+        for k in range(length):
+            i = (i + 1) & 0xFF
+            a = S[i]
+            j = (j + a) & 0xFF
+            b = S[j]
+            S[i] = b
+            S[j] = a
+            out[k] = S[(a + b) & 0xFF]
+
+        self.i = i
+        self.j = j
+
+    def update(self, data):
+        """Encrypt (or decrypt) the next chunk of the stream."""
+        data = _as_buffer(data)
+        return _xor(data, self.keystream(len(data)))
+
+    def update_into(self, src, dst):
+        """Encrypt the next chunk of the stream from src straight into dst, src may be dst."""
+        src = _as_buffer(src)
+        out = memoryview(dst)
+        if out.readonly:
+            raise TypeError("dst must be a writable buffer")
+        if out.format != 'B' or out.ndim != 1:
+            out = out.cast('B')
+        n = len(src)
+        if len(out) < n:
+            raise ValueError("dst is smaller than src")
+
+        # keystream et xor dans la meme boucle: aucun tampon intermediaire
+        S = self.S
+        i = self.i
+        j = self.j
+
+        for k in range(n):
+            i = (i + 1) & 0xFF
+            a = S[i]
+            j = (j + a) & 0xFF
+            b = S[j]
+            S[i] = b
+            S[j] = a
+            out[k] = src[k] ^ S[(a + b) & 0xFF]
+
+        self.i = i
+        self.j = j
+        return dst
+
+
+def RC4(key, data):
+    return RC4Stream(key).update(data)
+
+
+def RC4_into(key, src, dst):
+    """Encrypt src into the caller-owned buffer dst and return dst."""
+    return RC4Stream(key).update_into(src, dst)
+
+
+def RC4_inplace(key, buf):
+    """Encrypt a writable buffer in place and return it."""
+    return RC4Stream(key).update_into(buf, buf)
+
+def RC4_file(key, src_path, dst_path, chunk_size=1 << 20):
+    """Encrypt (or decrypt) a file chunk by chunk, memory stays at a few chunk_size buffers."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    stream = RC4Stream(key)
+    in_buf = bytearray(chunk_size)
+    out_buf = bytearray(chunk_size)  # keystream puis resultat, reutilise a chaque bloc
+    in_view = memoryview(in_buf)
+    out_view = memoryview(out_buf)
+    total = 0
+
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        while True:
+            n = src.readinto(in_buf)
+            if not n:
+                break
+            stream.keystream_into(out_buf, n)
+            x = int.from_bytes(in_view[:n], 'little') ^ int.from_bytes(out_view[:n], 'little')
+            out_buf[:n] = x.to_bytes(n, 'little')
+            dst.write(out_view[:n])
+            total += n
+
+    return total
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="RC4 file encryption")
+    parser.add_argument('mode', choices=['enc', 'dec'])
+    parser.add_argument('--key', required=True)
+    parser.add_argument('--chunk-size', type=int, default=1 << 20)
+    parser.add_argument('input')
+    parser.add_argument('output')
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    start = time.perf_counter()
+    total = RC4_file(args.key, args.input, args.output, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    rate = total / (1024 * 1024) / elapsed if elapsed > 0 else float('inf')
+    print(f"{args.mode}: {total} bytes in {elapsed:.2f}s ({rate:.2f} MB/s)")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        main()
+    else:
+        key = "Key"
+        plaintext = "Hello, World!"
+
+        # Encrypt
+        ciphertext = RC4(key, plaintext)
+        print("Encrypted:", ' '.join(format(x, '02x') for x in ciphertext))
+
+        # Decrypt
+        decrypted = RC4(key, ciphertext)
+        print("Decrypted:", decrypted.decode())
@@ -0,0 +1,57 @@
+"""Classical ciphers, their crackers and RC4.
+
+Nothing is imported with the package: each name below loads its submodule
+(and numpy) on first access. The submodules RC4, kasiski_test and
+suffix_array share their name with a function, the package attribute is the
+submodule (crypto_algorithms.kasiski_test.kasiski_test is the function).
+"""
+import importlib
+
+# nom public -> sous-module qui le definit
+_API = {
+    'KSA': 'RC4', 'PRGA': 'RC4', 'RC4Stream': 'RC4', 'RC4_into': 'RC4', 'RC4_inplace': 'RC4', 'RC4_file': 'RC4',
+    'batch_keystream': 'rc4_batch', 'KeystreamHistogram': 'rc4_batch', 'keystream_histogram': 'rc4_batch',
+    'search_key': 'rc4_keysearch',
+    'LetterTable': 'substitution', 'translate': 'substitution',
+    'caesar_encrypt': 'caesar_cipher', 'caesar_decrypt': 'caesar_cipher',
+    'crack_caesar': 'caesar_cipher', 'crack_caesar_many': 'caesar_cipher',
+    'affine_encrypt': 'affine_cipher', 'affine_decrypt': 'affine_cipher', 'NotCoprimeError': 'affine_cipher',
+    'Ciphertext': 'ciphertext',
+    'EncodedText': 'vigenere_cipher', 'vigenere_encrypt': 'vigenere_cipher', 'vigenere_decrypt': 'vigenere_cipher',
+    'DecryptCache': 'vigenere_cipher', 'minimal_period': 'vigenere_cipher',
+    'vigenere_decrypt_many': 'vigenere_cipher', 'vigenere_encrypt_stream': 'vigenere_cipher',
+    'vigenere_decrypt_stream': 'vigenere_cipher', 'vigenere_file': 'vigenere_cipher',
+    'crack_affine_cipher': 'frequency_analysis', 'find_affine_key': 'frequency_analysis',
+    'score_text': 'frequency_analysis',
+    'crack_affine_cipher_french': 'frequency_analysis_french', 'find_affine_key_french': 'frequency_analysis_french',
+    'score_text_french': 'frequency_analysis_french',
+    'solve_columns': 'kasiski_test', 'try_key_variations': 'kasiski_test', 'ColumnScorer': 'kasiski_test',
+    'KasiskiAnalyzer': 'kasiski_test',
+    'anneal_vigenere': 'vigenere_anneal', 'Annealer': 'vigenere_anneal',
+    'Instrument': 'instrument',
+    'RepeatIndex': 'suffix_array',
+    'NgramScorer': 'ngram_scorer',
+    'LanguageModel': 'language_model', 'train': 'language_model', 'get_model': 'language_model',
+    'get_scorer': 'language_model',
+    'crack_job': 'batch_crack', 'crack_batch': 'batch_crack',
+    'CrackServer': 'crack_server',
+}
+
+_SUBMODULES = sorted(set(_API.values()) | {'benchmark', 'benchmark_translate', 'check_imports'})
+
+__all__ = sorted(_API)
+
+
+def __getattr__(name):
+    if name in _API:
+        value = getattr(importlib.import_module(f'.{_API[name]}', __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # les acces suivants ne passent plus par ici
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_API) | set(_SUBMODULES))
@@ -0,0 +1,28 @@
+import importlib
+import sys
+
+# commande -> sous-module dont le main(argv) est lance
+COMMANDS = {
+    'rc4': 'RC4',
+    'rc4-keysearch': 'rc4_keysearch',
+    'vigenere': 'vigenere_cipher',
+    'model': 'language_model',
+    'batch': 'batch_crack',
+    'serve': 'crack_server',
+    'bench': 'benchmark',
+    'check-imports': 'check_imports',
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print("usage: python -m crypto_algorithms {" + ','.join(COMMANDS) + "} ...", file=sys.stderr)
+        sys.exit(2)
+    module = importlib.import_module(f'crypto_algorithms.{COMMANDS[argv[0]]}')
+    sys.argv[0] = f"python -m crypto_algorithms {argv[0]}"  # pour les messages d'argparse
+    module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    main()
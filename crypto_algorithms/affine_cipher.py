@@ -0,0 +1,70 @@
+import math
+from functools import lru_cache
+from .substitution import LetterTable, translate
+
+# class exception pour gérer le cas ou a n'est pas premier avec 26
+class NotCoprimeError(Exception):
+    pass
+
+
+@lru_cache(maxsize=64)
+def affine_encrypt_table(a, b):
+    """Translation table for x -> a*x + b, non-letters become spaces like affine_encrypt."""
+    return LetterTable([(i * a + b) % 26 for i in range(26)], other=' ')
+
+
+@lru_cache(maxsize=64)
+def affine_decrypt_table(a, b):
+    """Translation table for y -> a^-1 * (y - b), non-letters are kept."""
+    a_inverse = pow(a, -1, 26)
+    return LetterTable([(a_inverse * ((i - b) % 26)) % 26 for i in range(26)])
+
+
+def affine_encrypt(plain, a, b):
+    try:
+        a = int(a)
+        b = int(b)
+    except ValueError:
+        print("NUMBERS PLEASE")
+        return
+    
+    plain_text = plain.lower()
+    #verifier si a et b sont premiers avec 26, sinon raise an exception
+    if math.gcd(a,26)!=1:
+        raise NotCoprimeError("a has to be coprime with 26")
+    else:
+        return translate(plain_text, affine_encrypt_table(a % 26, b % 26))
+    
+    
+def affine_decrypt(cipher, a, b):
+    try:
+        a = int(a)
+        b = int(b)
+    except ValueError:
+        print("NUMBERS PLEASE")
+        return
+    
+    cipher_text = cipher.lower()
+    
+    # verifier si a et b sont premiers avec 26, sinon raise an exception
+    if math.gcd(a, 26) != 1:
+        raise NotCoprimeError("a must be coprime with 26")
+    
+    # la table calcule l'inverse de a une seule fois par cle
+    return translate(cipher_text, affine_decrypt_table(a % 26, b % 26))
+    
+    
+if __name__ == "__main__":
+    try:
+        encrypted = affine_encrypt("bonjour, je suis entrain d'apprendre comment casser le chiffrement affine avec une analyse frequentielle", 17, 20)
+        print("Encrypted:", encrypted)
+
+        decrypted = affine_decrypt(encrypted, 17, 20)
+        print("Decrypted:", decrypted)
+
+    except NotCoprimeError as e:
+        print(f"Error: {e}")
+    except ValueError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print(f"Unexpected error: {e}")
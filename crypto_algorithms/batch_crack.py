@@ -0,0 +1,206 @@
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .affine_cipher import affine_decrypt
+from .caesar_cipher import crack_caesar, caesar_decrypt
+from .frequency_analysis import find_affine_key_histogram
+from .kasiski_test import kasiski_test
+from .language_model import get_scorer, model_path, get_model
+from .ngram_scorer import LANGUAGE_FREQUENCIES
+
+CIPHER_TYPES = ('caesar', 'affine', 'vigenere')
+
+# chargés une fois par processus worker
+_scorers = {}
+_bigrams = {}
+_timeout = None
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise JobTimeout()
+
+
+def check_timeout(timeout):
+    """Raise ValueError for a job timeout this platform cannot enforce (no SIGALRM, on Windows)."""
+    if timeout and not hasattr(signal, 'SIGALRM'):
+        raise ValueError("a job timeout needs SIGALRM, which this platform does not have")
+
+
+def _init_worker(languages, timeout):
+    global _timeout
+    # check_timeout a deja refuse un timeout sans SIGALRM
+    if timeout and hasattr(signal, 'SIGALRM'):
+        _timeout = timeout
+        signal.signal(signal.SIGALRM, _on_alarm)
+    for language in languages:
+        _scorers[language] = get_scorer(language)
+        if os.path.exists(model_path(language)):
+            _bigrams[language] = get_model(language).tables.get(2)
+
+
+def crack_job(job):
+    """Crack one {id, cipher_type, language, ciphertext} record, returns the result record."""
+    cipher_type = job['cipher_type']
+    language = job.get('language', 'en')
+    if language not in LANGUAGE_FREQUENCIES:
+        raise ValueError(f"unknown language {language!r}, expected one of {tuple(LANGUAGE_FREQUENCIES)}")
+    ciphertext = job['ciphertext']
+    frequencies = LANGUAGE_FREQUENCIES[language]
+    scorer = _scorers.get(language) or get_scorer(language)
+
+    if cipher_type == 'caesar':
+        key, score = crack_caesar(ciphertext, language)[0]
+        plaintext = caesar_decrypt(ciphertext, key)
+    elif cipher_type == 'affine':
+        key = find_affine_key_histogram(ciphertext, frequencies, _bigrams.get(language))
+        if key is None:
+            raise ValueError("the ciphertext has no letter")
+        plaintext = affine_decrypt(ciphertext, *key)
+        score = scorer(plaintext)
+    elif cipher_type == 'vigenere':
+        results = kasiski_test(ciphertext, ranking='combined', scorer=scorer, frequencies=frequencies, processes=1)
+        if not results:
+            raise ValueError("no key length candidate found")
+        _, key, plaintext, score = results[0]
+    else:
+        raise ValueError(f"unknown cipher_type {cipher_type!r}, expected one of {CIPHER_TYPES}")
+
+    return {'id': job.get('id'), 'cipher_type': cipher_type, 'language': language,
+            'key': key, 'plaintext': plaintext, 'score': float(score)}
+
+
+def _crack_chunk(chunk):
+    results = []
+    for index, job, error in chunk:
+        if error is not None:  # ligne illisible
+            results.append((index, error))
+            continue
+        try:
+            if _timeout:
+                signal.setitimer(signal.ITIMER_REAL, _timeout)
+            try:
+                result = crack_job(job)
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except JobTimeout:
+            result = {'id': job.get('id'), 'error': f"timeout after {_timeout}s"}
+        except Exception as e:
+            result = {'id': job.get('id'), 'error': f"{type(e).__name__}: {e}"}
+        results.append((index, result))
+    return results
+
+
+def read_jobs(lines):
+    """(index, job, error) for each JSONL line, error is the result record of a line that cannot be parsed."""
+    index = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        job = error = None
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict) or 'ciphertext' not in job or 'cipher_type' not in job:
+                raise ValueError("a job needs at least cipher_type and ciphertext")
+        except ValueError as e:
+            error = {'id': job.get('id') if isinstance(job, dict) else None,
+                     'error': f"bad input line {index + 1}: {e}"}
+        yield index, job, error
+        index += 1
+
+
+def _chunks(jobs, chunk_size):
+    chunk = []
+    for item in jobs:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def crack_batch(lines, out, workers=None, chunk_size=64, timeout=None, ordered=True, languages=('en', 'fr')):
+    """Crack a JSONL stream of jobs in a process pool and write one JSON result per line to out.
+
+    In ordered mode the results that arrive ahead of an older job wait in
+    memory; no new chunk is submitted while more than 4 * workers chunks of
+    jobs sit behind the oldest unfinished one.
+    """
+    check_timeout(timeout)
+    unknown = set(languages) - set(LANGUAGE_FREQUENCIES)
+    if unknown:
+        raise ValueError(f"unknown languages {sorted(unknown)}, expected some of {tuple(LANGUAGE_FREQUENCIES)}")
+    workers = workers or os.cpu_count() or 1
+    pending = {}      # resultats arrives en avance, en mode ordonne
+    state = {'next': 0, 'written': 0}
+
+    def collect(futures):
+        for future in futures:
+            for index, result in future.result():
+                if ordered:
+                    pending[index] = result
+                else:
+                    out.write(json.dumps(result, ensure_ascii=False) + '\n')
+                    state['written'] += 1
+        while state['next'] in pending:
+            out.write(json.dumps(pending.pop(state['next']), ensure_ascii=False) + '\n')
+            state['next'] += 1
+            state['written'] += 1
+
+    window = 4 * workers * chunk_size  # jobs soumis au plus au-dela du plus ancien non ecrit
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(languages, timeout)) as pool:
+        running = set()
+        # pas plus de 2 chunks par worker en vol, et en mode ordonne pas plus de window jobs en attente
+        # derriere un job lent: la memoire ne depend pas de la taille du batch
+        for chunk in _chunks(read_jobs(lines), chunk_size):
+            running.add(pool.submit(_crack_chunk, chunk))
+            submitted = chunk[-1][0] + 1
+            while running and (len(running) >= 2 * workers or ordered and submitted - state['next'] > window):
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(running)
+
+    return state['written']
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Crack a JSONL batch of ciphertexts")
+    parser.add_argument('input', nargs='?', default='-')
+    parser.add_argument('output', nargs='?', default='-')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=64)
+    parser.add_argument('--timeout', type=float, default=None, help="seconds per job")
+    parser.add_argument('--unordered', action='store_true', help="write results as soon as they are ready")
+    args = parser.parse_args(argv)
+    try:
+        check_timeout(args.timeout)
+    except ValueError as e:
+        parser.error(str(e))
+
+    src = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    dst = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        count = crack_batch(src, dst, args.workers, args.chunk_size, args.timeout, not args.unordered)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    elapsed = time.perf_counter() - start
+    print(f"{count} jobs in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f} jobs/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import json
+import platform
+import sys
+import time
+from functools import lru_cache, partial
+
+import numpy as np
+
+from .RC4 import RC4
+from .affine_cipher import affine_encrypt, affine_decrypt
+from .caesar_cipher import caesar_encrypt, caesar_decrypt, crack_caesar
+from .frequency_analysis import (ENGLISH_LETTER_FREQUENCIES, ENGLISH_COMMON_WORDS, AFFINE_KEYS,
+                                 crack_affine_cipher)
+from .frequency_analysis_french import (FRENCH_LETTER_FREQUENCIES, FRENCH_COMMON_WORDS, score_text_french,
+                                        crack_affine_cipher_french)
+from .kasiski_test import kasiski_test
+from .ngram_scorer import french_scorer
+from .vigenere_cipher import vigenere_encrypt, vigenere_decrypt
+
+KB = 1 << 10
+MB = 1 << 20
+SIZES = (KB, 10 * KB, 100 * KB, MB, 10 * MB, 100 * MB)
+CRACK_LENGTHS = (50, 100, 200, 500, 1000, 5000)
+
+LANGUAGES = {'en': (ENGLISH_LETTER_FREQUENCIES, ENGLISH_COMMON_WORDS),
+             'fr': (FRENCH_LETTER_FREQUENCIES, FRENCH_COMMON_WORDS)}
+VOCABULARY_SIZE = 5000
+
+
+def vocabulary(language, seed=0):
+    """The common words of a language followed by random words drawn from its letter frequencies."""
+    frequencies, common_words = LANGUAGES[language]
+    rng = np.random.default_rng(seed)
+    p = np.array(frequencies) / sum(frequencies)
+    lengths = rng.integers(2, 12, VOCABULARY_SIZE)
+    letters = (rng.choice(26, lengths.sum(), p=p) + ord('a')).astype(np.uint8).tobytes().decode('ascii')
+    ends = np.cumsum(lengths).tolist()
+    return list(common_words) + [letters[end - length:end] for end, length in zip(ends, lengths.tolist())]
+
+
+@lru_cache(maxsize=None)
+def synthetic_text(size, language='fr', seed=0):
+    """size characters of lowercase words and spaces, word ranks follow a Zipf law (same seed, same text)."""
+    words = vocabulary(language, seed)
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, len(words) + 1)
+    weights /= weights.sum()
+    mean_length = float((np.array([len(word) for word in words]) + 1) @ weights)
+    parts = []
+    length = 0
+    while length < size:
+        picks = rng.choice(len(words), int((size - length) / mean_length) + 16, p=weights)
+        part = ' '.join([words[i] for i in picks.tolist()]) + ' '
+        parts.append(part)
+        length += len(part)
+    return ''.join(parts)[:size]
+
+
+# nom, taille max (None: toutes), preparation hors chronometre: texte -> fonction a chronometrer
+CASES = [
+    ('RC4', None, lambda text: partial(RC4, b'benchmark key', text.encode('ascii'))),
+    ('caesar_decrypt', None, lambda text: partial(caesar_decrypt, text, 7)),
+    ('affine_decrypt', None, lambda text: partial(affine_decrypt, text, 17, 20)),
+    ('vigenere_decrypt', None, lambda text: partial(vigenere_decrypt, text, 'benchmark')),
+    ('score_text_french', MB, lambda text: partial(score_text_french, text)),
+    ('french_scorer', 10 * MB, lambda text: partial(french_scorer().score, text)),
+    ('kasiski_test', MB, lambda text: partial(kasiski_test, vigenere_encrypt(text, 'clef'))),
+]
+
+
+def measure(func, min_time=1.0, min_repeats=3, max_repeats=100):
+    """Run times in seconds, at least min_repeats runs and until min_time has passed."""
+    times = []
+    total = 0.0
+    while len(times) < min_repeats or (total < min_time and len(times) < max_repeats):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return times
+
+
+def throughput(names=None, sizes=SIZES, max_size=10 * MB, seed=0, min_time=1.0, log=None):
+    """Latency percentiles and MB/s of each function on each corpus size."""
+    results = []
+    for name, case_max, setup in CASES:
+        if names and name not in names:
+            continue
+        for size in sizes:
+            if size > max_size or (case_max and size > case_max):
+                continue
+            func = setup(synthetic_text(size, 'fr', seed))
+            times = np.array(measure(func, min_time)) * 1000
+            p50, p90, p99 = np.percentile(times, [50, 90, 99]).tolist()
+            result = {'name': name, 'size': size, 'repeats': len(times), 'min_ms': float(times.min()),
+                      'p50_ms': p50, 'p90_ms': p90, 'p99_ms': p99, 'mb_per_s': size / MB / (p50 / 1000)}
+            results.append(result)
+            if log:
+                log(f"{name:<18}{size:>11}{p50:>12.3f}{p90:>12.3f}{p99:>12.3f}{result['mb_per_s']:>10.2f}")
+    return results
+
+
+def _crack_caesar(text, rng):
+    key = int(rng.integers(1, 26))
+    return key, crack_caesar(caesar_encrypt(text, key), 'en')[0][0]
+
+
+def _crack_affine(text, rng, crack):
+    key = AFFINE_KEYS[int(rng.integers(1, len(AFFINE_KEYS)))]  # (1, 0) ne chiffre rien
+    return key, tuple(crack(affine_encrypt(text, *key))[1])
+
+
+def _crack_vigenere(text, rng):
+    key = ''.join(chr(ord('a') + c) for c in rng.integers(0, 26, int(rng.integers(3, 9))).tolist())
+    cipher = vigenere_encrypt(text, key)
+    results = kasiski_test(cipher)
+    found = results[0][1] if results else ''
+    # 'clefclef' dechiffre comme 'clef': on compare les textes
+    return vigenere_decrypt(cipher, key), found and vigenere_decrypt(cipher, found)
+
+
+# nom, langue du texte, fonction (texte, rng) -> (cle attendue, cle trouvee)
+CRACKERS = [
+    ('crack_caesar', 'en', _crack_caesar),
+    ('crack_affine_cipher', 'en', partial(_crack_affine, crack=crack_affine_cipher)),
+    ('crack_affine_cipher_french', 'fr', partial(_crack_affine, crack=crack_affine_cipher_french)),
+    ('kasiski_test', 'fr', _crack_vigenere),
+]
+
+
+def accuracy(names=None, lengths=CRACK_LENGTHS, trials=20, seed=0, log=None):
+    """Share of keys found and mean time of each cracker, per ciphertext length."""
+    results = []
+    for name, language, crack in CRACKERS:
+        if names and name not in names:
+            continue
+        corpus = synthetic_text(MB, language, seed)
+        for length in lengths:
+            rng = np.random.default_rng([seed, length])
+            found = 0
+            elapsed = 0.0
+            for _ in range(trials):
+                start = int(rng.integers(0, len(corpus) - length))
+                text = corpus[start:start + length].strip()
+                begin = time.perf_counter()
+                expected, guess = crack(text, rng)
+                elapsed += time.perf_counter() - begin
+                found += expected == guess
+            result = {'name': name, 'length': length, 'trials': trials,
+                      'accuracy': found / trials, 'mean_ms': elapsed / trials * 1000}
+            results.append(result)
+            if log:
+                log(f"{name:<28}{length:>7}{result['accuracy']:>10.2f}{result['mean_ms']:>12.3f}")
+    return results
+
+
+def run(names=None, max_size=10 * MB, trials=20, seed=0, min_time=1.0, log=print):
+    """The whole suite as a JSON-ready dict."""
+    if log:
+        log(f"{'function':<18}{'size':>11}{'p50 (ms)':>12}{'p90 (ms)':>12}{'p99 (ms)':>12}{'MB/s':>10}")
+    timings = throughput(names, max_size=max_size, seed=seed, min_time=min_time, log=log)
+    if log:
+        log(f"\n{'cracker':<28}{'length':>7}{'accuracy':>10}{'mean (ms)':>12}")
+    cracks = accuracy(names, trials=trials, seed=seed, log=log)
+    return {'meta': {'python': platform.python_version(), 'numpy': np.__version__,
+                     'machine': platform.machine(), 'seed': seed, 'trials': trials,
+                     'date': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'throughput': timings, 'accuracy': cracks}
+
+
+def compare(baseline, current, tolerance=0.10, accuracy_tolerance=0.05):
+    """Regressions of current against baseline: p50 and min slower by more than tolerance, accuracy lower."""
+    regressions = []
+    before = {(r['name'], r['size']): r for r in baseline.get('throughput', [])}
+    for r in current.get('throughput', []):
+        old = before.get((r['name'], r['size']))
+        # le minimum aussi, pour ne pas signaler le bruit des mesures de quelques microsecondes
+        if old and r['p50_ms'] > old['p50_ms'] * (1 + tolerance) and r['min_ms'] > old['min_ms'] * (1 + tolerance):
+            regressions.append(f"{r['name']} {r['size']} B: p50 {old['p50_ms']:.3f} -> {r['p50_ms']:.3f} ms "
+                               f"({r['p50_ms'] / old['p50_ms'] - 1:+.0%})")
+    before = {(r['name'], r['length']): r for r in baseline.get('accuracy', [])}
+    for r in current.get('accuracy', []):
+        old = before.get((r['name'], r['length']))
+        if old and r['accuracy'] < old['accuracy'] - accuracy_tolerance:
+            regressions.append(f"{r['name']} length {r['length']}: accuracy "
+                               f"{old['accuracy']:.2f} -> {r['accuracy']:.2f}")
+    return regressions
+
+
+def _size(text):
+    units = {'K': KB, 'M': MB}
+    return int(float(text[:-1]) * units[text[-1].upper()]) if text[-1].upper() in units else int(text)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the ciphers and crackers")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_cmd = commands.add_parser('run')
+    run_cmd.add_argument('--out', help="write the results as JSON")
+    run_cmd.add_argument('--baseline', help="compare with a stored result file")
+    run_cmd.add_argument('--only', nargs='+', help="function or cracker names")
+    run_cmd.add_argument('--max-size', type=_size, default=10 * MB, help="largest corpus, e.g. 100M")
+    run_cmd.add_argument('--trials', type=int, default=20)
+    run_cmd.add_argument('--seed', type=int, default=0)
+    run_cmd.add_argument('--min-time', type=float, default=1.0, help="seconds per measurement")
+    run_cmd.add_argument('--tolerance', type=float, default=0.10)
+    compare_cmd = commands.add_parser('compare')
+    compare_cmd.add_argument('baseline')
+    compare_cmd.add_argument('current')
+    compare_cmd.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        current = run(args.only, args.max_size, args.trials, args.seed, args.min_time)
+        if args.out:
+            with open(args.out, 'w') as f:
+                json.dump(current, f, indent=2)
+        if not args.baseline:
+            return
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+
+    regressions = compare(baseline, current, args.tolerance)
+    for regression in regressions:
+        print("REGRESSION", regression)
+    if not regressions:
+        print("no regression")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
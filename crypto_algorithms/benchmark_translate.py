@@ -0,0 +1,77 @@
+import random
+import string
+import time
+
+from .caesar_cipher import caesar_encrypt
+from .affine_cipher import affine_encrypt, affine_decrypt
+
+
+# les anciennes boucles caractere par caractere, gardees comme reference
+def caesar_encrypt_loop(plain, key):
+    result = ""
+    for char in plain.lower().strip():
+        if char.isalpha():
+            result += chr((ord(char) - ord('a') + key) % 26 + ord('a'))
+        else:
+            result += char
+    return result
+
+
+def affine_encrypt_loop(plain, a, b):
+    result = ''
+    for char in plain.lower():
+        if char.isalpha():
+            result += chr(((ord(char) - ord('a')) * a + b) % 26 + ord('a'))
+        else:
+            result += ' '
+    return result
+
+
+def affine_decrypt_loop(cipher, a, b):
+    a_inverse = pow(a, -1, 26)
+    result = ''
+    for char in cipher.lower():
+        if char.isalpha():
+            result += chr((a_inverse * ((ord(char) - ord('a') - b) % 26)) % 26 + ord('a'))
+        else:
+            result += char
+    return result
+
+
+def random_text(size, accents=False, seed=0):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + "      ,.'!0123"
+    if accents:
+        alphabet += "éèàç"  # texte non ascii: translate passe par le chemin lent
+    return ''.join(rng.choice(alphabet) for _ in range(size))
+
+
+def best_time(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=(1_000, 100_000, 1_000_000)):
+    cases = [
+        ("caesar_encrypt", caesar_encrypt_loop, caesar_encrypt, (7,)),
+        ("affine_encrypt", affine_encrypt_loop, affine_encrypt, (17, 20)),
+        ("affine_decrypt", affine_decrypt_loop, affine_decrypt, (17, 20)),
+    ]
+    print(f"{'function':<16}{'text':>8}{'size':>10}{'loop (s)':>12}{'table (s)':>12}{'speedup':>10}")
+    for accents in (False, True):
+        for size in sizes:
+            text = random_text(size, accents)
+            for name, loop, table, args in cases:
+                assert loop(text, *args) == table(text, *args), name
+                t_loop = best_time(loop, text, *args)
+                t_table = best_time(table, text, *args)
+                kind = 'accents' if accents else 'ascii'
+                print(f"{name:<16}{kind:>8}{size:>10}{t_loop:>12.5f}{t_table:>12.5f}{t_loop / t_table:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run()
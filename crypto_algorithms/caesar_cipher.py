@@ -0,0 +1,73 @@
+from functools import lru_cache
+import numpy as np
+from .substitution import LetterTable, translate
+from .ngram_scorer import LANGUAGE_FREQUENCIES, _encode
+
+
+@lru_cache(maxsize=64)
+def caesar_table(key):
+    """Translation table shifting every letter by key (cached, key taken modulo 26)."""
+    return LetterTable([(i + key) % 26 for i in range(26)])
+
+
+def caesar_encrypt(plain, key):
+    plain_text = plain.lower().strip()
+    try:
+        key = int(key)  # on essaie de rendre la clé en un entier, si c'est pas possible alors ce n'est pas un nombre
+    except ValueError:
+        print("the key has to be a number")
+        return
+    
+    # on considere seulement les lettres minuscules (26 lettres), la table fait le decalage mod 26 pour chaque lettre
+    return translate(plain_text, caesar_table(key % 26))
+
+
+
+def caesar_decrypt(cipher,key):
+    cipher_text = cipher.lower().strip()
+    try:
+        key = int(key)
+    except ValueError:
+        print("key is not a number")
+        return
+
+    return translate(cipher_text, caesar_table(-key % 26))
+
+def _shift_matrix(language):
+    # circulant[j, k] = log-probabilite de la lettre claire quand la lettre chiffree j est decalee de k
+    frequencies = np.asarray(LANGUAGE_FREQUENCIES[language], dtype=float)
+    log_freq = np.log(frequencies / frequencies.sum())
+    return log_freq[(np.arange(26)[:, None] - np.arange(26)[None, :]) % 26]
+
+
+def crack_caesar(cipher, language='en'):
+    """All 26 keys ranked by the log-likelihood of the decryption, from one letter count.
+
+    The key is the one caesar_decrypt expects, so caesar_decrypt(cipher, ranked[0][0]) is the best guess.
+    """
+    letters, is_letter = _encode(cipher.lower().strip())
+    counts = np.bincount(letters[is_letter], minlength=26)
+    scores = counts @ _shift_matrix(language)
+    order = np.argsort(-scores, kind='stable')
+    return [(k, float(scores[k])) for k in order.tolist()]
+
+
+def crack_caesar_many(records, language='en'):
+    """Best (key, score) for each record, all records counted in a single vectorized pass."""
+    texts = [record.lower().strip() for record in records]
+    if not texts:
+        return []
+    letters, is_letter = _encode(''.join(texts))
+    # numero du record de chaque caractere, puis une seule bincount sur (record, lettre)
+    owner = np.repeat(np.arange(len(texts)), [len(text) for text in texts])
+    counts = np.bincount(owner[is_letter] * 26 + letters[is_letter], minlength=len(texts) * 26)
+    scores = counts.reshape(len(texts), 26) @ _shift_matrix(language)
+    keys = scores.argmax(axis=1)
+    return [(k, float(score)) for k, score in zip(keys.tolist(), scores[np.arange(len(texts)), keys].tolist())]
+
+
+if __name__ == "__main__":
+    encrypted = caesar_encrypt('lina is amazing', 20)
+    print(encrypted)
+    decrypted = caesar_decrypt(encrypted,20)
+    print(decrypted)
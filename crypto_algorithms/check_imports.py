@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+
+PACKAGE = 'crypto_algorithms'
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# temps passe dans les modules du package pendant un import, numpy et la bibliotheque standard
+# ne comptent pas (ms). Un module et ceux du package qu'il importe comptent ensemble.
+BUDGET_MS = 50
+PACKAGE_BUDGET_MS = 5
+
+
+def import_profile(module):
+    """(self times in µs by module name, stdout) of importing a module in a fresh interpreter."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(self_us)
+    return times, proc.stdout
+
+
+def own_import_ms(module, repeat=5):
+    """Best time over `repeat` fresh imports spent in the package's own modules, and their stdout."""
+    best = float('inf')
+    output = ''
+    for _ in range(repeat):
+        times, output = import_profile(module)
+        own = sum(us for name, us in times.items() if name == PACKAGE or name.startswith(PACKAGE + '.'))
+        best = min(best, own / 1000)
+    return best, output, times
+
+
+def check(budget_ms=BUDGET_MS, repeat=5):
+    """Import the package and each submodule, returns the list of budget or side-effect failures."""
+    from crypto_algorithms import _SUBMODULES
+
+    failures = []
+    ms, output, times = own_import_ms(PACKAGE, repeat)
+    print(f"{PACKAGE:<40}{ms:>8.2f} ms")
+    if ms > PACKAGE_BUDGET_MS:
+        failures.append(f"{PACKAGE}: {ms:.2f} ms > {PACKAGE_BUDGET_MS} ms")
+    loaded = [name for name in times if name != PACKAGE and (name.startswith(PACKAGE) or name == 'numpy')]
+    if loaded:
+        failures.append(f"{PACKAGE}: importing the package loads {', '.join(loaded)}")
+    if output:
+        failures.append(f"{PACKAGE}: prints at import")
+
+    for name in _SUBMODULES:
+        module = f'{PACKAGE}.{name}'
+        ms, output, _ = own_import_ms(module, repeat)
+        print(f"{module:<40}{ms:>8.2f} ms")
+        if ms > budget_ms:
+            failures.append(f"{module}: {ms:.2f} ms > {budget_ms} ms")
+        if output:
+            failures.append(f"{module}: prints at import")
+    return failures
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check that importing the package does no work")
+    parser.add_argument('--budget', type=float, default=BUDGET_MS, help="ms per submodule")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failures = check(args.budget, args.repeat)
+    for failure in failures:
+        print("FAIL", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
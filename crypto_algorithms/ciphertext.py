@@ -0,0 +1,113 @@
+from functools import cached_property
+
+import numpy as np
+
+from .vigenere_cipher import EncodedText
+
+
+class Ciphertext(EncodedText):
+    """A ciphertext cleaned and encoded once, shared by the analysis functions.
+
+    On top of EncodedText (uint8 letter indices and the letter mask), the
+    cleaned letters, the non-letter positions, the letter and bigram
+    histograms and the per-column counts are computed on first use and kept.
+    frequency_analysis, frequency_analysis_french and kasiski_test take it
+    wherever they take a string; str() gives the original text back.
+    """
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.text = text
+        self._column_counts = {}
+        self._column_frequencies = {}
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"Ciphertext({self.text[:20]!r}{'...' if len(self.text) > 20 else ''})"
+
+    @cached_property
+    def cleaned(self):
+        """Lowercase letters only, as ''.join(c for c in text.lower() if c.isalpha()) gives them."""
+        if self.ascii is None:
+            # toutes les lettres sont a-z: ce sont exactement les indices encodes
+            return (self.letters + ord('a')).tobytes().decode('ascii')
+        return ''.join(c for c in self.text.lower() if c.isalpha())
+
+    @cached_property
+    def non_letters(self):
+        """Positions of the characters that are not letters, to put a text back together."""
+        return np.flatnonzero(~self.mask)
+
+    @cached_property
+    def histograms(self):
+        """letter_histograms of the text: counts of the 26 letters and of the 26x26 adjacent pairs.
+
+        Read from the encoded letters and mask, without going back to the text.
+        Like letter_histograms, only the letters a-z count: a non-ascii letter
+        (é...) is left out and breaks the pairs around it.
+        """
+        letters = self.letters.astype(np.intp)
+        positions = np.flatnonzero(self.mask)
+        # deux lettres forment une paire si elles se suivent dans le texte
+        pairs = positions[1:] == positions[:-1] + 1
+        if self.ascii is None:
+            unigrams = np.bincount(letters, minlength=26)
+        else:
+            unigrams = np.bincount(letters[self.ascii], minlength=26)
+            pairs &= self.ascii[:-1] & self.ascii[1:]
+        bigrams = np.bincount(letters[:-1][pairs] * 26 + letters[1:][pairs], minlength=26 * 26).reshape(26, 26)
+        return unigrams, bigrams
+
+    def column_counts(self, key_length):
+        """Letter counts of every column for a key length, a (key_length, 26) array."""
+        counts = self._column_counts.get(key_length)
+        if counts is None:
+            letters = self.letters.astype(np.intp)
+            columns = np.arange(len(letters)) % key_length
+            counts = np.bincount(columns * 26 + letters, minlength=key_length * 26).reshape(key_length, 26)
+            self._column_counts[key_length] = counts
+        return counts
+
+    def columns(self, key_length):
+        """Cleaned letters of every column for a key length (split_ciphertext)."""
+        cleaned = self.cleaned
+        return [cleaned[i::key_length] for i in range(key_length)]
+
+    def column_frequencies(self, key_length, analysis):
+        """analysis(column) of every column for a key length, computed once per key length."""
+        frequencies = self._column_frequencies.get((key_length, analysis))
+        if frequencies is None:
+            frequencies = [analysis(column) for column in self.columns(key_length)]
+            self._column_frequencies[key_length, analysis] = frequencies
+        return frequencies
+
+
+def as_ciphertext(text):
+    """The Ciphertext of a text, the object itself if it already is one."""
+    return text if isinstance(text, Ciphertext) else Ciphertext(text)
+
+
+def clean(text):
+    """Lowercase letters of a str or Ciphertext, the cached copy for a Ciphertext."""
+    if isinstance(text, Ciphertext):
+        return text.cleaned
+    return ''.join(c for c in text.lower() if c.isalpha())
+
+
+def letter_histograms(text):
+    """Counts of the 26 letters and of the 26x26 pairs of adjacent letters, in one pass."""
+    if isinstance(text, Ciphertext):
+        return text.histograms
+    return _letter_histograms(text)
+
+
+def _letter_histograms(text):
+    codes = np.frombuffer(text.lower().encode('utf-32-le'), dtype=np.uint32)
+    is_letter = (codes >= ord('a')) & (codes <= ord('z'))
+    letters = codes.astype(np.intp) - ord('a')
+    unigrams = np.bincount(letters[is_letter], minlength=26)
+    pairs = is_letter[:-1] & is_letter[1:]
+    bigrams = np.bincount(letters[:-1][pairs] * 26 + letters[1:][pairs], minlength=26 * 26).reshape(26, 26)
+    return unigrams, bigrams
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch_crack import _init_worker, _crack_chunk, check_timeout, read_jobs
+
+
+def job_key(job):
+    """Hash of (ciphertext, cipher, language): two jobs with the same key have the same answer."""
+    fields = [job['ciphertext'], job['cipher_type'], job.get('language', 'en')]
+    return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _crack_one(job):
+    return _crack_chunk([(0, job, None)])[0][1]
+
+
+class CrackServer:
+    """JSON lines over TCP in front of the crackers.
+
+    Each request line is a job as in batch_crack ({id, cipher_type, language,
+    ciphertext}), each answer line is its result record with the same id.
+    Answers come in completion order. A line {"command": "stats"} returns the
+    cache and coalescing counters.
+
+    Identical jobs in flight share one worker call, finished results are kept
+    in an LRU cache. A client may half-close its side once its jobs are sent,
+    the answers still come. When a client disconnects its jobs are cancelled: a job
+    still queued is dropped unless another client waits for it, a job already
+    running in a worker finishes and goes to the cache.
+    """
+
+    def __init__(self, workers=None, cache_size=1024, timeout=None, languages=('en', 'fr'), line_limit=1 << 24):
+        check_timeout(timeout)
+        self.line_limit = line_limit  # taille max d'une ligne de requete
+        self.workers = workers or os.cpu_count() or 1
+        # forkserver: un worker cree par fork garderait une copie des sockets clients ouverts,
+        # et la deconnexion d'un client ne serait jamais vue
+        self.pool = ProcessPoolExecutor(self.workers, multiprocessing.get_context('forkserver'),
+                                        _init_worker, (languages, timeout))
+        self.cache = OrderedDict()   # job_key -> resultat sans id
+        self.cache_size = cache_size
+        self.inflight = {}           # job_key -> [future du pool, future asyncio, nombre de requetes qui l'attendent]
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'coalesced': 0, 'cancelled': 0}
+
+    def _finished(self, key, future):
+        self.inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if 'error' in result:  # un timeout peut passer la prochaine fois, on ne garde pas les erreurs
+            return
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def crack(self, job):
+        """Result record of a job, from the cache, a job already in flight or a new worker call."""
+        self.stats['requests'] += 1
+        key = job_key(job)
+        if key in self.cache:
+            self.stats['hits'] += 1
+            self.cache.move_to_end(key)
+            return {**self.cache[key], 'id': job.get('id')}
+
+        entry = self.inflight.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            loop = asyncio.get_running_loop()
+            work = self.pool.submit(_crack_one, job)
+            # le callback tourne dans un thread du pool, l'etat du serveur ne change que dans la boucle
+            work.add_done_callback(lambda f: loop.call_soon_threadsafe(self._finished, key, f))
+            entry = self.inflight[key] = [work, asyncio.wrap_future(work), 0]
+        else:
+            self.stats['coalesced'] += 1
+
+        work, future, _ = entry
+        entry[2] += 1
+        try:
+            # shield: annuler une requete ne doit pas annuler le calcul des autres
+            result = await asyncio.shield(future)
+        finally:
+            entry[2] -= 1
+            # personne n'attend plus: un job encore dans la file du pool est retire,
+            # un job deja lance ne peut pas l'etre et finira dans le cache
+            if entry[2] == 0 and work.cancel():
+                self.stats['cancelled'] += 1
+        return {**result, 'id': job.get('id')}
+
+    async def _answer(self, line, writer):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if isinstance(request, dict) and request.get('command') == 'stats':
+            answer = {**self.stats, 'cached': len(self.cache), 'inflight': len(self.inflight)}
+        else:
+            _, job, error = next(read_jobs([line]))
+            answer = error if error is not None else await self.crack(job)
+        writer.write((json.dumps(answer, ensure_ascii=False) + '\n').encode('utf-8'))
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # ligne trop longue: on ne lit plus, les reponses en cours partent quand meme
+                    break
+                if not line:  # fin d'ecriture du client (shutdown SHUT_WR, nc -N...): il attend encore ses reponses
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._answer(line.decode('utf-8', errors='replace'), writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await self._finish(tasks, writer)
+        except ConnectionError:  # deconnexion brutale pendant la lecture
+            pass
+        finally:
+            # il ne reste des taches que si le client est vraiment parti
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+    async def _finish(self, tasks, writer):
+        # les reponses restantes, tant que la connexion existe: wait_closed() se termine quand le
+        # transport est perdu (ecriture refusee par un client parti), les taches sont alors annulees
+        closed = asyncio.create_task(writer.wait_closed())
+        try:
+            while tasks and not closed.done() and not writer.transport.is_closing():
+                await asyncio.wait(tasks | {closed}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            closed.cancel()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        server = await asyncio.start_server(self.handle, host, port, limit=self.line_limit)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the crackers over TCP, one JSON job per line")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-size', type=int, default=1024)
+    parser.add_argument('--timeout', type=float, default=None, help="seconds per job")
+    args = parser.parse_args(argv)
+    try:
+        check_timeout(args.timeout)
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = CrackServer(args.workers, args.cache_size, args.timeout)
+    print(f"listening on {args.host}:{args.port} with {server.workers} workers")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import collections
+import math
+import numpy as np
+from .affine_cipher import affine_decrypt
+from .ciphertext import clean, letter_histograms
+
+# Letter frequencies of English text in percent, a to z
+ENGLISH_LETTER_FREQUENCIES = [8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153,
+                              0.772, 4.025, 2.406, 6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056,
+                              2.758, 0.978, 2.360, 0.150, 1.974, 0.074]
+
+
+# les 312 cles affines valides (a premier avec 26)
+AFFINE_KEYS = [(a, b) for a in range(1, 26) if math.gcd(a, 26) == 1 for b in range(26)]
+RERANK_KEYS = 10  # meilleures cles de l'histogramme re-notees par le scorer quand il y en a un
+
+
+def crack_affine_cipher(ciphertext, scorer=None, method='histogram', bigram_logprobs=None): #ciphertext: str ou Ciphertext
+    key = find_affine_key(ciphertext, scorer, method, bigram_logprobs)
+    if not key:
+        return "could not crack the cipher"
+    
+    a,b = key
+    decrypted = affine_decrypt(str(ciphertext), a, b)
+    return decrypted, key
+
+
+def find_affine_key(ciphertext, scorer=None, method='histogram', bigram_logprobs=None): #scorer: n'importe quelle fonction texte -> score (score_text par defaut)
+    #method='histogram': le scorer re-note les RERANK_KEYS meilleures cles, bigram_logprobs (26x26) s'ajoute au modele
+    if method == 'histogram':
+        return find_affine_key_histogram(ciphertext, ENGLISH_LETTER_FREQUENCIES, bigram_logprobs, scorer)
+    if bigram_logprobs is not None:
+        raise ValueError("bigram_logprobs only applies to method='histogram'")
+    
+    english_freq = ['e','t','a','o','i','n','s','h']
+    cipher_freq = freqAnalysis(ciphertext)
+    
+    most_common = list(cipher_freq.keys())[:2] #review this
+    if len(most_common) < 2: #pas assez de lettres differentes
+        return None
+    
+    possible_keys = []
+    
+    for p1 in range(min(4,len(english_freq))):
+        for p2 in range(min(4, len(english_freq))):
+            if p1 == p2: continue
+            
+            plain1, plain2= ord(english_freq[p1] )- ord('a'), ord(english_freq[p2] )- ord('a')
+            cipher1, cipher2 = ord(most_common[0]) - ord('a'), ord(most_common[1]) - ord('a')
+            
+            key = solve_affine_parameters(cipher1, cipher2, plain1, plain2)
+            
+            if key:
+                possible_keys.append(key)
+    #apres avoir eu toutes nos clés possibles, on cherche quelle est la plus correcte
+    
+    text = str(ciphertext)
+    decryptions = [affine_decrypt(text,a,b) for a,b in possible_keys]
+    scores = score_texts(scorer or score_text, decryptions)
+    
+    best_key = None
+    best_score = float('-inf')  # les log-probabilites sont negatives
+    for (a,b), score in zip(possible_keys, scores):
+        if score > best_score:
+            best_score = score
+            best_key = (a,b)
+    
+    return best_key
+    
+
+def score_texts(score_fn, texts):
+    """Scores of many texts, in one batch when score_fn is an NgramScorer (score_many)."""
+    if hasattr(score_fn, 'score_many'):
+        return score_fn.score_many(texts) # tous les candidats en une passe
+    return [score_fn(text) for text in texts]
+
+
+def affine_key_scores(ciphertext, frequencies, bigram_logprobs=None):
+    """Log-likelihood of all 312 affine keys from the ciphertext histograms, without decrypting.
+
+    With a 26x26 bigram log-probability table the pairs of letters are scored too.
+    Returns ((a, b), score) sorted from best to worst, [] when the text has no
+    letter. A Ciphertext gives its cached histograms.
+    """
+    unigrams, bigrams = letter_histograms(ciphertext)
+    if not unigrams.any():
+        return []
+    keys = np.array(AFFINE_KEYS)
+    # encrypted[k, p] = lettre chiffree de la lettre claire p sous la cle k
+    encrypted = (keys[:, :1] * np.arange(26)[None, :] + keys[:, 1:]) % 26
+    
+    # l'histogramme du texte clair est celui du chiffre permute par la cle
+    log_freq = np.log(np.asarray(frequencies, dtype=float) / np.sum(frequencies))
+    scores = unigrams[encrypted] @ log_freq
+    if bigram_logprobs is not None:
+        table = np.asarray(bigram_logprobs, dtype=float).reshape(26, 26)
+        plain_pairs = bigrams[encrypted[:, :, None], encrypted[:, None, :]]
+        scores = scores + (plain_pairs * table[None, :, :]).sum(axis=(1, 2))
+    
+    order = np.argsort(-scores, kind='stable')
+    return [(AFFINE_KEYS[k], float(scores[k])) for k in order.tolist()]
+
+
+def find_affine_key_histogram(ciphertext, frequencies, bigram_logprobs=None, scorer=None, rerank=RERANK_KEYS):
+    """Best of all 312 affine keys, scored from histograms only (global optimum of the model).
+
+    With a scorer (text -> score or an NgramScorer) only the `rerank` best keys
+    of the model are decrypted and the scorer picks among them.
+    None when the text has no letter.
+    """
+    ranked = affine_key_scores(ciphertext, frequencies, bigram_logprobs)
+    if not ranked:
+        return None
+    if scorer is None:
+        return ranked[0][0]
+    keys = [key for key, _ in ranked[:rerank]]
+    text = str(ciphertext)
+    scores = score_texts(scorer, [affine_decrypt(text, a, b) for a, b in keys])
+    return keys[int(np.argmax(scores))]
+
+
+def freqAnalysis(ciphertext):
+    #nettoyer la chaine (deja fait une fois pour toutes dans un Ciphertext)
+    cleaned_text = clean(ciphertext)
+    
+    #utiliser collections pour compter le nombre d'occurences
+    letter_counter = collections.Counter(cleaned_text)
+    
+    #calculate the frequencies
+    total_letters = len(cleaned_text)
+    frequencies = {letter : (count / total_letters)*100 for letter, count in letter_counter.items()}
+    
+    return dict(sorted(frequencies.items(), key=lambda x: x[1], reverse=True)) #review
+
+
+
+def solve_affine_parameters(c1, c2, p1, p2):
+    diff_c = (c1 - c2) % 26
+    diff_p = (p1 - p2) % 26
+    
+    if math.gcd(diff_p,26) != 1:
+        return None
+    
+    try:
+        inv_diff_p = pow(diff_p, -1, 26)
+    except ValueError:
+        return None
+    
+    a = (diff_c * inv_diff_p)%26
+    
+    if math.gcd(a, 26) != 1:
+        return None
+    
+    
+    b = (c1 - a*p1)%26
+    return (a,b)
+
+ENGLISH_COMMON_WORDS = ['the', 'and', 'that', 'have', 'for', 'not', 'with', 'you', 'this', 'but']
+ENGLISH_COMMON_BIGRAMS = ['th', 'he', 'in', 'er', 'an', 're', 'on', 'at', 'en', 'nd']
+
+def score_text(text):
+    words = text.lower().split()
+    score = 0
+    
+    for word in words:
+        if word in ENGLISH_COMMON_WORDS:
+            score += 10
+    
+    for i in range(len(text) - 1):
+        bigram = text[i:i+2].lower()
+        if bigram in ENGLISH_COMMON_BIGRAMS:
+            score += 1
+    
+    return score
+
@@ -0,0 +1,192 @@
+import collections
+import math
+from .affine_cipher import affine_encrypt, affine_decrypt_table
+from .ciphertext import clean
+from .frequency_analysis import find_affine_key_histogram, score_texts, AFFINE_KEYS, RERANK_KEYS
+from .instrument import NULL
+
+def affine_decrypt(ciphertext, a, b):
+    """Decrypt text using affine cipher with given key."""
+    if math.gcd(a, 26) != 1:
+        return ""
+    
+    return ciphertext.lower().translate(affine_decrypt_table(a % 26, b % 26))
+
+def frequency_analysis(ciphertext):
+    """Count letter frequencies in the ciphertext (a str or a Ciphertext, cleaned once)."""
+
+    cleaned_text = clean(ciphertext)
+    
+    letter_count = collections.Counter(cleaned_text)
+    
+    total_letters = len(cleaned_text)
+    frequencies = {letter: (count / total_letters) * 100 for letter, count in letter_count.items()}
+    
+    return dict(sorted(frequencies.items(), key=lambda x: x[1], reverse=True))
+
+def solve_affine_parameters(p1, c1, p2, c2):
+    """Solve for 'a' and 'b' given two plaintext/ciphertext mappings."""
+
+    diff_p = (p1 - p2) % 26
+    diff_c = (c1 - c2) % 26
+    
+    if math.gcd(diff_p, 26) != 1:
+        return None
+    
+    try:
+        inv_diff_p = pow(diff_p, -1, 26)
+    except ValueError:
+        return None
+    
+    a = (diff_c * inv_diff_p) % 26
+    
+    if math.gcd(a, 26) != 1:
+        return None
+
+    b = (c1 - a * p1) % 26
+    
+    return (a,b)
+
+
+
+# Letter frequencies of French text in percent, a to z
+FRENCH_LETTER_FREQUENCIES = [7.636, 0.901, 3.260, 3.669, 14.715, 1.066, 0.866, 0.737, 7.529, 0.613,
+                             0.074, 5.456, 2.968, 7.095, 5.796, 2.521, 1.362, 6.693, 7.948, 7.244,
+                             6.311, 1.838, 0.049, 0.427, 0.128, 0.326]
+
+# Common French words, bigrams, trigrams and quadgrams used by score_text_french
+FRENCH_COMMON_WORDS = ['le', 'la', 'les', 'un', 'une', 'des', 'et', 'est', 'en', 'que', 
+                       'qui', 'dans', 'pour', 'pas', 'sur', 'ce', 'il', 'je', 'vous', 'de',
+                       'avec', 'du', 'au', 'par', 'nous', 'mais', 'ou', 'si', 'leur',
+                       'sont', 'cette', 'tout', 'ces', 'plus','distribuer','crypto']
+FRENCH_COMMON_BIGRAMS = ['es', 'le', 'de', 'en', 'on', 'nt', 'an', 're', 'er', 'ur', 'it', 'te', 'ou', 'ai']
+FRENCH_COMMON_TRIGRAMS = ['ent', 'les', 'que', 'des', 'ont', 'ant', 'ion', 'our', 'ment', 'est']
+FRENCH_COMMON_QUADGRAMS = ['tion', 'ment', 'ique', 'pour', 'eurs', 'iste']
+
+def score_text_french(text):
+    """Score a text based on common French patterns."""
+    score = 0
+    
+    words = text.lower().split()
+    for word in words:
+        if word in FRENCH_COMMON_WORDS:
+            score += 10
+    
+    # Check for common bigrams
+    for i in range(len(text) - 1):
+        bigram = text[i:i+2].lower()
+        if bigram in FRENCH_COMMON_BIGRAMS:
+            score += 1
+
+    for i in range(len(text) - 2):
+        trigram = text[i:i+3]
+        if trigram in FRENCH_COMMON_TRIGRAMS:
+            score += 3
+    
+    for i in range(len(text) - 3):
+        quadgram = text[i:i+4]
+        if quadgram in FRENCH_COMMON_QUADGRAMS:
+            score += 5
+    
+    return score
+
+def find_affine_key_french(ciphertext, scorer=None, method='histogram', instrument=None, bigram_logprobs=None):
+    """Try to find the affine cipher key using frequency analysis for French.
+
+    method='histogram' scores all 312 keys from the letter counts (and the
+    26x26 bigram_logprobs table if given), without decrypting; a scorer then
+    re-scores the RERANK_KEYS best keys. method='pairs' tries the two most
+    frequent letters against common French letters; scorer is then any
+    text -> score callable (score_text_french by default), an NgramScorer
+    scores all the candidates in one batch. Returns None when the text has
+    too few letters. instrument: an instrument.Instrument for stage times and counters.
+    """
+    instrument = instrument or NULL
+    if method == 'histogram':
+        with instrument, instrument.stage('scoring'):
+            instrument.count('candidates', len(AFFINE_KEYS))
+            if scorer is not None:
+                instrument.count('score_calls', RERANK_KEYS)
+            return find_affine_key_histogram(ciphertext, FRENCH_LETTER_FREQUENCIES, bigram_logprobs, scorer)
+    if bigram_logprobs is not None:
+        raise ValueError("bigram_logprobs only applies to method='histogram'")
+    with instrument:
+        return _find_affine_key_pairs(ciphertext, scorer, instrument)
+
+def _find_affine_key_pairs(ciphertext, scorer, instrument):
+
+    french_freq = ['e', 'a', 's', 'i', 'n', 't', 'r', 'u', 'l', 'o']
+    
+
+    with instrument.stage('frequencies'):
+        cipher_freq = frequency_analysis(ciphertext)
+    
+    most_common = list(cipher_freq.keys())[:2]
+    if len(most_common) < 2:
+        return None
+
+    possible_keys = []
+
+    for p1 in range(min(6, len(french_freq))): 
+        for p2 in range(min(6, len(french_freq))): 
+            if p1 == p2:
+                continue
+                
+            plain1, plain2 = ord(french_freq[p1]) - ord('a'), ord(french_freq[p2]) - ord('a')
+
+            cipher1, cipher2 = ord(most_common[0]) - ord('a'), ord(most_common[1]) - ord('a')
+            
+            key = solve_affine_parameters(plain1, cipher1, plain2, cipher2)
+            if key:
+                instrument.message("we will append the key {}", key)
+                possible_keys.append(key)
+            else:
+                instrument.message("no key found :( ")
+    instrument.count('candidates', len(possible_keys))
+    
+    # Decrypt with each possible key
+    with instrument.stage('decrypt'):
+        text = str(ciphertext)
+        decryptions = [affine_decrypt(text, a, b) for a, b in possible_keys]
+    instrument.count('decrypts', len(decryptions))
+    
+    # Score the decryptions based on French patterns
+    score_fn = scorer or score_text_french
+    with instrument.stage('scoring'):
+        scores = score_texts(score_fn, decryptions)
+    instrument.count('score_calls', len(decryptions))
+    
+    # Test each possible key
+    best_key = None
+    best_score = float('-inf')  # les log-probabilites sont negatives
+    
+    for (a, b), score in zip(possible_keys, scores):
+        if score > best_score:
+            best_score = score
+            best_key = (a, b)
+    
+    return best_key
+
+def crack_affine_cipher_french(ciphertext, scorer=None, method='histogram', instrument=None, bigram_logprobs=None):
+    """Attempt to crack an affine cipher using French language patterns."""
+    key = find_affine_key_french(ciphertext, scorer, method, instrument, bigram_logprobs)
+    
+    if not key:
+        return "Impossible de déchiffrer le texte.", (0, 0)
+    
+    a, b = key
+    decrypted = affine_decrypt(str(ciphertext), a, b)
+    return decrypted, key
+
+if __name__ == "__main__":
+    encrypted = "lyhrywx  rk owao khfxuah t uppxkhtxk cyqqkhf cuookx zk cjabbxkqkhf ubbahk unkc whk uhuzmok bxkgwkhfakzzk" 
+    
+    decrypted, key = crack_affine_cipher_french(encrypted)
+    print(f"Texte chiffré: {encrypted}")
+    print(f"Texte déchiffré: {decrypted}")
+    print(f"Clé trouvée: a={key[0]}, b={key[1]}")
+    
+    print("\nAnalyse de fréquence:")
+    freq = frequency_analysis(encrypted)
+    for letter, percentage in freq.items():
+        print(f"{letter}: {percentage:.2f}%")
\ No newline at end of file
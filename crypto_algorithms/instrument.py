@@ -0,0 +1,137 @@
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class Instrument:
+    """Stage timers, counters and events of a cracking run.
+
+    Every event goes to callback(event, data): 'stage' when a stage ends
+    ({'name', 'seconds'}), 'message' for a progress line ({'text'}), and the
+    events the crackers emit. With profile=True (cProfile) or trace_memory=True
+    (tracemalloc) the code run inside `with instrument:` is captured too.
+    """
+
+    enabled = True
+
+    def __init__(self, callback=None, profile=False, trace_memory=False):
+        self.callback = callback
+        self.stages = {}    # nom -> [appels, secondes]
+        self.counters = {}
+        self.profiler = cProfile.Profile() if profile else None
+        self.trace_memory = trace_memory
+        self.memory_peak = None
+        self._depth = 0     # les crackers s'appellent entre eux, seul le with le plus externe compte
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            entry = self.stages.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            self.event('stage', name=name, seconds=elapsed)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def event(self, name, /, **data):
+        if self.callback:
+            self.callback(name, data)
+
+    def message(self, text, *args):
+        """Progress line, formatted with text.format(*args) only if someone listens."""
+        if self.callback:
+            self.callback('message', {'text': text.format(*args) if args else text})
+
+    def __enter__(self):
+        self._depth += 1
+        if self._depth == 1:
+            if self.trace_memory:
+                tracemalloc.start()
+            if self.profiler:
+                self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            if self.profiler:
+                self.profiler.disable()
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                self.memory_peak = max(self.memory_peak or 0, peak)
+        return False
+
+    def summary(self, top=20):
+        """JSON-ready summary: stage times, counters, memory peak and the `top` functions by cumulative time."""
+        summary = {'stages': {name: {'calls': calls, 'seconds': seconds}
+                              for name, (calls, seconds) in self.stages.items()},
+                   'counters': dict(self.counters)}
+        if self.memory_peak is not None:
+            summary['memory_peak_bytes'] = self.memory_peak
+        if self.profiler:
+            stats = pstats.Stats(self.profiler).sort_stats('cumulative')
+            summary['profile'] = [
+                {'function': f"{path}:{line}({name})", 'calls': calls, 'seconds': total, 'cumulative': cumulative}
+                for (path, line, name), (_, calls, total, cumulative, _) in
+                sorted(stats.stats.items(), key=lambda item: -item[1][3])[:top]]
+        return summary
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.summary(), **kwargs)
+
+
+class NullInstrument:
+    """Instrumentation turned off: every call does nothing."""
+
+    enabled = False
+    _stage = nullcontext()
+
+    def stage(self, name):
+        return self._stage
+
+    def count(self, name, n=1):
+        pass
+
+    def event(self, name, /, **data):
+        pass
+
+    def message(self, text, *args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def summary(self, top=20):
+        return {}
+
+    def to_json(self, **kwargs):
+        return '{}'
+
+
+NULL = NullInstrument()
+
+
+def print_events(event, data):
+    """Callback printing the progress lines, as the crackers used to."""
+    if event == 'message':
+        print(data['text'])
+
+
+class Results(list):
+    """Results of a cracker with the instrumentation summary of the run that produced them."""
+
+    def __init__(self, results, summary):
+        super().__init__(results)
+        self.summary = summary
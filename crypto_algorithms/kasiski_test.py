@@ -0,0 +1,859 @@
+import math
+from functools import lru_cache, reduce
+from collections import defaultdict
+import numpy as np
+from .frequency_analysis import freqAnalysis
+from .frequency_analysis_french import (score_text_french, FRENCH_LETTER_FREQUENCIES, FRENCH_COMMON_WORDS, FRENCH_COMMON_BIGRAMS,
+                                       FRENCH_COMMON_TRIGRAMS, FRENCH_COMMON_QUADGRAMS)
+from .vigenere_cipher import EncodedText, DecryptCache, encode, decrypt_cache, minimal_period
+from .ciphertext import Ciphertext, as_ciphertext, clean
+from .suffix_array import RepeatIndex
+from .vigenere_anneal import Annealer
+from .instrument import NULL, Results, Instrument, print_events
+
+#trouver les sequences de 3 caracteres qui se repètent
+def find_repeated_sequences(ciphertext):
+    cipher = clean(ciphertext)
+    
+    sequences_positions = {}
+    
+    for i in range(len(cipher) - 2):
+        seq = cipher[i:i+3]
+        if seq in sequences_positions:
+            sequences_positions[seq].append(i) #si la clé qui est la seq existe, append i à la liste de positions qui est la valeur
+        else:
+            sequences_positions[seq] = [i] # si cette clé n'existe pas on la crée et initilise la liste des indices
+    
+    repeated_sequences = {seq : positions for seq, positions in sequences_positions.items() if len(positions)>1} #prendre uniquement les séquences qui se repétent plus d'une fois
+    return repeated_sequences # on sort avec un dict qui a les sequences comme clés et une liste des indices où ils se repétent comme valeur
+
+
+def find_maximal_repeats(ciphertext, min_length=None):
+    """Maximal repeated substrings of the cleaned ciphertext as (length, sorted positions)."""
+    letters = encode(ciphertext).letters
+    if min_length is None:
+        # plus court que ~log26(n), une repetition arrive par hasard
+        min_length = max(3, int(math.log(max(len(letters), 1), 26)) + 2)
+    return RepeatIndex(letters).maximal_repeats(min_length)
+
+
+def weighted_distances(repeats):
+    """Distances between consecutive occurrences of each repeat, weighted by the repeat length."""
+    if not repeats:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    lengths = np.array([length for length, _ in repeats])
+    sizes = np.array([len(positions) for _, positions in repeats])
+    positions = np.concatenate([positions for _, positions in repeats])
+
+    # une seule diff sur toutes les positions, puis on enleve les frontieres entre repetitions
+    distances = np.delete(np.diff(positions), np.cumsum(sizes)[:-1] - 1)
+    weights = np.repeat(lengths, sizes - 1)
+    return distances, weights
+
+
+def find_key_lengths_weighted(distances, weights, max_key_length=40):
+    """Like find_key_lengths, but every distance votes for its divisors with its weight."""
+    potential_lengths = {}
+    for length in range(2, max_key_length + 1):
+        score = int(weights[distances % length == 0].sum())
+        if score:
+            potential_lengths[length] = score
+    return sorted(potential_lengths.items(), key=lambda x: x[1], reverse=True)
+
+
+def calculate_distances(repeated_sequences): #calculer les distances entre les indices
+    seq_differences = {} 
+    
+    for seq, positions in repeated_sequences.items():
+        if len(positions) < 2:
+                continue
+        
+        for i in range(len(positions)-1):
+            diff = positions[i+1] - positions[i] #on calcule les differences entre les indices deux à deux
+            if seq in seq_differences:
+                seq_differences[seq].append(diff)
+            else:
+                seq_differences[seq] = [diff]
+    return seq_differences # on sort avec un dict ayant les sequences comme clés, et les differences d'indices deux à deux comme valeur
+           
+def find_gcd_of_list(numbers): #calcule le pgcd de plusieurs nombres
+    return reduce(math.gcd, numbers)
+
+def distances_pgcd(seq_differences):
+    sequence_gcds = {}
+    for seq, diffs in seq_differences.items(): #dans le dict de sequence x liste_diff 
+        if diffs:
+            diff_gcd = find_gcd_of_list(diffs) # on calcule le pgcd de tt les distances
+            sequence_gcds[seq] = diff_gcd
+    
+    return sequence_gcds # on sort avec un dict ayant les sequences comme clés et le pgcd de toutes les differences comme valeur
+
+def gcd_occurences(sequence_gcds):
+    
+    gcd_counter = defaultdict(int)
+    
+    for gcd in sequence_gcds.values(): #on calcule le nombre de fois qu'un pgcd se repéte, it will represent the most likely length of the key
+        gcd_counter[gcd] += 1
+    
+    return dict(gcd_counter) # on sort avec un dict ayant comme clé les pgcd et comme valeur leur occurrences
+
+def find_divisors(n): #calcule les diviseurs d'un nombre
+    small = []
+    large = []
+    for i in range(1, math.isqrt(n) + 1): # les pgcd valent jusqu'a la longueur du texte: on s'arrete a la racine
+        if n % i == 0:
+            small.append(i)
+            if i != n // i:
+                large.append(n // i)
+    return small + large[::-1]
+
+def find_key_lengths(gcd_counter): # given un pgcd, on calcule les longueurs possibles des clés
+    potential_lengths = defaultdict(int)
+    
+    sorted_gcds = dict(sorted(gcd_counter.items(), key=lambda x: x[1], reverse=True)) #we sort te gcds and their occurrences in descending order
+    
+    for gcd, count in sorted_gcds.items():
+        if gcd>1:
+            divisors = find_divisors(gcd) #les diviseurs du pgcd sont les valeurs possibles de la clé
+            for divisor in divisors:
+                if divisor>1:
+                    potential_lengths[divisor] += count #on calcule le nombre d'occurrences de chaque diviseur pour voir which one is the likeliest
+    
+    return sorted(potential_lengths.items(), key=lambda x: x[1], reverse=True)
+
+# indice de coincidence d'un texte francais et d'un texte aleatoire
+FRENCH_IOC = 0.0778
+RANDOM_IOC = 1 / 26
+# part de l'ecart langue - aleatoire qu'une periode peut perdre et compter encore comme la bonne
+IOC_TOLERANCE = 0.25
+
+def column_ioc(ciphertext, max_key_length=40):
+    """Average index of coincidence of the columns for every period 1..max_key_length, as a dict."""
+    if isinstance(ciphertext, Ciphertext):
+        # les comptes restent dans le Ciphertext, solve_columns les reprend
+        return counts_ioc(ciphertext.column_counts(period) for period in range(1, max_key_length + 1))
+    letters = encode(ciphertext).letters.astype(np.intp)
+    positions = np.arange(len(letters))
+    # une seule bincount sur (colonne, lettre) par periode, sans construire les groupes
+    return counts_ioc(np.bincount((positions % period) * 26 + letters, minlength=period * 26).reshape(period, 26)
+                      for period in range(1, max_key_length + 1))
+
+def counts_ioc(period_counts):
+    """column_ioc from the (period, 26) column counts of the periods 1, 2, ... in order."""
+    iocs = {}
+    
+    for period, counts in enumerate(period_counts, 1):
+        sizes = counts.sum(axis=1)
+        valid = sizes > 1
+        if not valid.any():
+            break
+        coincidences = (counts * (counts - 1)).sum(axis=1)[valid]
+        iocs[period] = float(np.mean(coincidences / (sizes[valid] * (sizes[valid] - 1))))
+    
+    return iocs
+
+def ioc_key_lengths(ciphertext, max_key_length=40, language_ioc=FRENCH_IOC, tolerance=IOC_TOLERANCE):
+    """Key lengths ranked by average column index of coincidence (Friedman test), see rank_iocs.
+
+    The periods stop at letters // 8: shorter columns have an IoC too noisy to rank.
+    """
+    letters = len(encode(ciphertext).letters)
+    iocs = column_ioc(ciphertext, max(1, min(max_key_length, letters // 8)))
+    return rank_iocs(iocs, language_ioc, tolerance)
+
+def rank_iocs(iocs, language_ioc=FRENCH_IOC, tolerance=IOC_TOLERANCE):
+    """(period, IoC) pairs of a column_ioc dict, the likeliest key length first.
+
+    Every multiple of the key length has the IoC of the language too, and a
+    long period with a few letters per column can beat it by chance. So the
+    periods whose IoC is within tolerance of the language IoC (or of the best
+    IoC, for a text below it) come first, shortest first, then the others by
+    IoC.
+    """
+    if not iocs:
+        return []
+    reference = min(max(iocs.values()), language_ioc)
+    threshold = reference - tolerance * (reference - RANDOM_IOC)
+    close = sorted((period, ioc) for period, ioc in iocs.items() if ioc >= threshold)
+    others = sorted((item for item in iocs.items() if item[1] < threshold), key=lambda x: x[1], reverse=True)
+    return close + others
+
+def combined_key_lengths(kasiski_lengths, ioc_lengths, ioc_weight=0.5, language_ioc=FRENCH_IOC):
+    """Merge Kasiski votes and column IoC into one score in [0, 1] per key length."""
+    kasiski = dict(kasiski_lengths)
+    iocs = dict(ioc_lengths)
+    top_votes = max(kasiski.values(), default=0)
+    
+    scores = {}
+    for length in set(kasiski) | set(iocs):
+        votes = kasiski.get(length, 0) / top_votes if top_votes else 0.0
+        # 0 pour un texte aleatoire, 1 pour la langue
+        ioc = (iocs.get(length, RANDOM_IOC) - RANDOM_IOC) / (language_ioc - RANDOM_IOC)
+        ioc = min(max(ioc, 0.0), 1.0)
+        scores[length] = ioc_weight * ioc + (1 - ioc_weight) * votes
+    
+    return sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+
+def split_ciphertext(ciphertext, key_length): #ceci va diviser le texte crypté en des groupes selon la longeur de la clé
+    cipher = clean(ciphertext)
+    
+    #le groupe i prend une lettre sur key_length à partir de la position i
+    return [cipher[i::key_length] for i in range(key_length)]
+
+
+def determine_key(groups, ref_letter='e'):
+    return key_from_frequencies([freqAnalysis(group) for group in groups], ref_letter)
+
+def key_from_frequencies(group_frequencies, ref_letter='e'):
+    """determine_key from the freqAnalysis of every group, computed once for all the reference letters."""
+    key = ''
+    for freq in group_frequencies:
+        if not freq:  # Skip empty groups
+            continue
+        # Get the most frequent letter in this group
+        most_frequent = list(freq.keys())[0]
+        
+        # Calculate the shift needed to transform most_frequent to ref_letter
+        shift = (ord(most_frequent) - ord(ref_letter)) % 26
+        key_letter = chr(shift + ord('a'))
+        
+        key += key_letter
+    
+    return key
+
+def column_counts(ciphertext, key_length):
+    """Letter counts of every column, a (key_length, 26) array, from one bincount."""
+    if isinstance(ciphertext, Ciphertext):
+        return ciphertext.column_counts(key_length)
+    letters = encode(ciphertext).letters.astype(np.intp)
+    columns = np.arange(len(letters)) % key_length
+    return np.bincount(columns * 26 + letters, minlength=key_length * 26).reshape(key_length, 26)
+
+def solve_columns(ciphertext, key_length, frequencies=FRENCH_LETTER_FREQUENCIES, method='correlation', alternatives=3):
+    """Best key for a key length, comparing each column with the language under all 26 shifts at once.
+
+    Returns the key and, for every column, the `alternatives` best letters with their confidence.
+    """
+    return solve_counts(column_counts(ciphertext, key_length), frequencies, method, alternatives)
+
+def solve_counts(counts, frequencies=FRENCH_LETTER_FREQUENCIES, method='correlation', alternatives=3):
+    """solve_columns from the (key_length, 26) column counts."""
+    _check_option('method', method, ('correlation', 'chi2'))
+    key_length = len(counts)
+    expected = np.asarray(frequencies, dtype=float)
+    expected = expected / expected.sum()
+    # shifted[k, j] = lettre claire quand la lettre chiffrée j est déchiffrée avec le décalage k
+    shifted = (np.arange(26)[None, :] - np.arange(26)[:, None]) % 26
+    
+    if method == 'chi2':
+        sizes = counts.sum(axis=1)[:, None, None]
+        observed = np.zeros((key_length, 26, 26))
+        # histogramme du texte clair pour chaque décalage: permutation des colonnes de counts
+        observed[:, np.arange(26)[:, None], shifted] = counts[:, None, :]
+        wanted = sizes * expected[None, None, :]
+        chi2 = ((observed - wanted) ** 2 / np.where(wanted > 0, wanted, 1)).sum(axis=2)
+        evidence = -chi2 / 2
+    else:
+        # produit par une matrice circulante: log-vraisemblance de chaque décalage
+        circulant = np.log(expected)[shifted].T
+        evidence = counts @ circulant
+    
+    # confiance: softmax sur les 26 décalages de chaque colonne
+    weights = np.exp(evidence - evidence.max(axis=1, keepdims=True))
+    confidence = weights / weights.sum(axis=1, keepdims=True)
+    order = np.argsort(-evidence, axis=1, kind='stable')
+    
+    key = ''.join(chr(k + ord('a')) for k in order[:, 0].tolist())
+    ranked = [[(chr(k + ord('a')), float(confidence[c, k])) for k in order[c, :alternatives].tolist()]
+              for c in range(key_length)]
+    return key, ranked
+
+REPEATS = ('suffix', 'trigrams')
+RANKINGS = ('kasiski', 'ioc', 'combined')
+SOLVERS = ('correlation', 'chi2', 'reference')
+
+def _check_option(name, value, choices):
+    if value not in choices:
+        raise ValueError(f"unknown {name} {value!r}, expected one of {choices}")
+
+def kasiski_test(ciphertext, repeats='suffix', ranking='kasiski', solver='correlation', scorer=None,
+                 frequencies=FRENCH_LETTER_FREQUENCIES, fallback=True, processes=1, time_budget=10.0, cache=None,
+                 instrument=None):
+    """Key candidates of a Vigenère ciphertext as (key_length, key, plaintext, score), best first.
+
+    The returned list has a .summary attribute: stage times and counters of
+    the run when an Instrument is given (see instrument.py), {} otherwise.
+    ciphertext is a str or a Ciphertext; a str is cleaned and encoded once
+    into a Ciphertext that every stage shares.
+
+    repeats is 'suffix' (maximal repeats, weighted) or 'trigrams'; ranking is
+    'kasiski', 'ioc' or 'combined'; solver is 'correlation' or 'chi2'
+    (solve_counts) or 'reference' (most frequent letter of each column taken
+    as e, a, s, i or n). Any other value raises ValueError.
+    """
+    _check_option('repeats', repeats, REPEATS)
+    _check_option('ranking', ranking, RANKINGS)
+    _check_option('solver', solver, SOLVERS)
+    ciphertext = as_ciphertext(ciphertext)
+    instrument = instrument or NULL
+    score_fn = scorer or score_text_french  # n'importe quelle fonction texte -> score
+    # une cle repetee ('clecle') ou deja vue n'est ni dechiffree ni notee deux fois
+    cache = decrypt_cache(cache, ciphertext, score_fn)
+    misses, score_calls = cache.misses, cache.score_calls
+    with instrument:
+        results = _kasiski_test(ciphertext, repeats, ranking, solver, score_fn, frequencies, fallback,
+                                processes, time_budget, cache, instrument)
+        instrument.count('decrypts', cache.misses - misses)
+        instrument.count('score_calls', cache.score_calls - score_calls)
+    return Results(results, instrument.summary())
+
+def _kasiski_test(ciphertext, repeats, ranking, solver, score_fn, frequencies, fallback, processes, time_budget,
+                  cache, instrument):
+    # Steps 1-4: Find key length candidates
+    if repeats == 'suffix':
+        # toutes les repetitions maximales, les distances pesent selon leur longueur
+        instrument.message("Indexing repeated sequences...")
+        with instrument.stage('repeats'):
+            maximal_repeats = find_maximal_repeats(ciphertext)
+        instrument.message("Found {} maximal repeated sequences.", len(maximal_repeats))
+        
+        instrument.message("Weighting distances...")
+        with instrument.stage('distances'):
+            distances, weights = weighted_distances(maximal_repeats)
+        
+        instrument.message("Determining potential key lengths...")
+        with instrument.stage('key_lengths'):
+            potential_key_lengths = find_key_lengths_weighted(distances, weights)
+    else:
+        instrument.message("Searching for repeated sequences...")
+        with instrument.stage('repeats'):
+            repeated_seqs = find_repeated_sequences(ciphertext)
+        instrument.message("Found {} repeated sequences.", len(repeated_seqs))
+        
+        instrument.message("Calculating distances...")
+        with instrument.stage('distances'):
+            distances = calculate_distances(repeated_seqs)
+        
+        instrument.message("Finding GCDs...")
+        with instrument.stage('gcd'):
+            gcds = distances_pgcd(distances)
+            instrument.message("Counting GCD occurrences...")
+            gcd_counts = gcd_occurences(gcds)
+        
+        instrument.message("Determining potential key lengths...")
+        with instrument.stage('key_lengths'):
+            potential_key_lengths = find_key_lengths(gcd_counts)
+    
+    if not potential_key_lengths and fallback and ranking != 'ioc':
+        # pas de repetitions (texte court): Kasiski n'a rien a classer, l'IoC se passe des repetitions
+        return anneal_key_lengths(ciphertext, score_fn, frequencies, processes, time_budget, cache=cache,
+                                  instrument=instrument)
+    
+    return _solve_key_lengths(ciphertext, potential_key_lengths, ranking, solver, frequencies, cache, instrument,
+                              lambda: ioc_key_lengths(ciphertext), ciphertext.column_counts)
+
+def _solve_key_lengths(ciphertext, potential_key_lengths, ranking, solver, frequencies, cache, instrument,
+                       ioc_lengths, counts_of):
+    # Steps 5-6: rank the key lengths, derive and score a key for the best ones
+    # ioc_lengths() et counts_of(key_length) viennent du texte entier ou de KasiskiAnalyzer
+    with instrument.stage('ranking'):
+        if ranking == 'ioc':
+            instrument.message("Ranking key lengths by index of coincidence...")
+            potential_key_lengths = ioc_lengths()
+        elif ranking == 'combined':
+            instrument.message("Combining Kasiski and index of coincidence...")
+            potential_key_lengths = combined_key_lengths(potential_key_lengths, ioc_lengths())
+    instrument.message("Top key length candidates: {}", potential_key_lengths[:5])
+    
+    results = []
+    
+    # Try each promising key length
+    for key_length, score in potential_key_lengths[:5]:  # Try top 5 candidates
+        instrument.message("\nTrying key length: {}", key_length)
+        
+        if solver != 'reference':
+            # toutes les colonnes et tous les décalages en une seule étape, un seul déchiffrement
+            with instrument.stage('key_derivation'):
+                best_key, _ = solve_counts(counts_of(key_length), frequencies, method=solver)
+            with instrument.stage('scoring'):
+                best_plaintext, best_score = cache.score(best_key)
+            instrument.count('candidates')
+        else:
+            # Split ciphertext into groups, their frequencies do not depend on the reference letter
+            column_frequencies = ciphertext.column_frequencies(key_length, freqAnalysis)
+            
+            # Try multiple reference letters for frequency analysis
+            best_key = ""
+            best_score = float('-inf')  # les log-probabilites sont negatives
+            best_plaintext = ""
+            
+            reference_letters = ['e', 'a', 's', 'i', 'n']  # Most common French letters
+            
+            for ref_letter in reference_letters:
+                # Determine key using this reference letter
+                with instrument.stage('key_derivation'):
+                    key = key_from_frequencies(column_frequencies, ref_letter)
+                # Decrypt and score the plaintext (once per distinct key)
+                with instrument.stage('scoring'):
+                    plaintext, text_score = cache.score(key)
+                instrument.count('candidates')
+                
+                if text_score > best_score:
+                    best_score = text_score
+                    best_key = key
+                    best_plaintext = plaintext
+        
+        results.append((key_length, best_key, best_plaintext, best_score))
+        instrument.event('candidate', key_length=key_length, key=best_key, score=best_score)
+        
+        instrument.message("Key length: {}, Key: {}, Score: {}", key_length, best_key, best_score)
+        instrument.message("Decryption sample: {}...", best_plaintext[:100])  # Show first 100 chars
+    
+    instrument.message("Decrypt cache: {} hits, {} misses", cache.hits, cache.misses)
+    
+    # Sort results by score
+    return rank_results(results)
+
+def rank_results(results):
+    """Sort (key_length, key, plaintext, score) candidates by score, best first.
+
+    A repeated key ('clefclef') decrypts like its minimal period and gets the
+    same score: on a tie the shorter minimal period, then the shorter length, comes first.
+    """
+    results.sort(key=lambda x: (-x[3], len(minimal_period(x[1])), x[0]))
+    return results
+
+
+def anneal_key_lengths(ciphertext, score_fn=score_text_french, frequencies=FRENCH_LETTER_FREQUENCIES,
+                       processes=1, time_budget=10.0, candidates=5, cache=None, instrument=None):
+    """Fallback of kasiski_test for texts too short to repeat: annealing on the best IoC key lengths.
+
+    A multiple of the minimal period of a key already found ('clef' for 4,
+    then 8 or 12) would only find that key again: it is skipped, and the next
+    key length tried, unless its IoC is clearly higher than the IoC of the
+    key length that gave the key (the key may be wrong). Up to candidates
+    key lengths are annealed.
+    All the key lengths share one Annealer, so processes > 1 (None: every CPU) starts a single pool.
+    """
+    instrument = instrument or NULL
+    with instrument.stage('ranking'):
+        key_lengths = ioc_key_lengths(ciphertext)
+    instrument.message("No repeated sequences, annealing key lengths among {}", [k for k, _ in key_lengths])
+    
+    # le recuit a besoin de tables de n-grammes (NgramScorer), une autre fonction sert seulement au classement
+    scorer = score_fn if hasattr(score_fn, 'tables') else None
+    cache = decrypt_cache(cache, ciphertext, score_fn)
+    results = []
+    found = []  # (periode minimale de la cle, IoC de sa longueur) des cles trouvees
+    margin = IOC_TOLERANCE * (FRENCH_IOC - RANDOM_IOC)
+    budget = time_budget / max(1, min(candidates, len(key_lengths)))
+    with Annealer(ciphertext, scorer=scorer, frequencies=frequencies, processes=processes,
+                  instrument=instrument) as annealer:
+        for key_length, ioc in key_lengths:
+            if len(results) == candidates:
+                break
+            if any(key_length % period == 0 and ioc < found_ioc + margin for period, found_ioc in found):
+                continue
+            with instrument.stage('annealing'):
+                key, _, _ = annealer.solve(key_length, time_budget=budget)
+            found.append((len(minimal_period(key)), ioc))
+            with instrument.stage('scoring'):
+                plaintext, score = cache.score(key)
+            instrument.count('candidates')
+            results.append((key_length, key, plaintext, score))
+    
+    return rank_results(results)
+
+
+class KasiskiAnalyzer:
+    """Kasiski test over ciphertext arriving in pieces.
+
+    feed(chunk) updates, in time proportional to the chunk, the last position
+    and the running GCD of the distances of every trigram and the column
+    letter counts of every period up to max_key_length. key_lengths() and
+    results() can be asked at any moment and give what kasiski_test gives on
+    the text fed so far with repeats='trigrams' (the suffix array index of the
+    maximal repeats would be rebuilt at each chunk). results() still decrypts
+    and scores the whole text, like kasiski_test.
+    """
+
+    def __init__(self, ranking='kasiski', solver='correlation', scorer=None, frequencies=FRENCH_LETTER_FREQUENCIES,
+                 fallback=True, processes=1, time_budget=10.0, max_key_length=40):
+        _check_option('ranking', ranking, RANKINGS)
+        _check_option('solver', solver, SOLVERS)
+        self.ranking = ranking
+        self.solver = solver
+        self.score_fn = scorer or score_text_french
+        self.frequencies = frequencies
+        self.fallback = fallback
+        self.processes = processes
+        self.time_budget = time_budget
+        self.max_key_length = max_key_length
+        self.chunks = []
+        self.length = 0  # nombre de lettres recues
+        self._tail = ''  # deux dernieres lettres: un trigramme peut etre coupe entre deux chunks
+        # trigramme -> [derniere position, pgcd des distances], 0 tant qu'il n'est vu qu'une fois (gcd(0, d) = d)
+        # le dict garde l'ordre de premiere apparition, comme find_repeated_sequences
+        self.sequences = {}
+        self.period_counts = [np.zeros((period, 26), dtype=np.int64) for period in range(1, max_key_length + 1)]
+
+    def feed(self, chunk):
+        """Add the next piece of ciphertext."""
+        self.chunks.append(chunk)
+        cleaned = ''.join(c for c in chunk.lower() if c.isalpha())
+        if not cleaned:
+            return
+        
+        text = self._tail + cleaned
+        start = self.length - len(self._tail)
+        sequences = self.sequences
+        for i in range(len(text) - 2):
+            seq = text[i:i+3]
+            entry = sequences.get(seq)
+            if entry is None:
+                sequences[seq] = [start + i, 0]
+            else:
+                entry[1] = math.gcd(entry[1], start + i - entry[0])
+                entry[0] = start + i
+        
+        letters = EncodedText(chunk).letters.astype(np.intp)
+        positions = np.arange(self.length, self.length + len(letters))
+        for period, counts in enumerate(self.period_counts, 1):
+            counts += np.bincount((positions % period) * 26 + letters, minlength=period * 26).reshape(period, 26)
+        
+        self.length += len(cleaned)
+        self._tail = text[-2:]
+
+    def text(self):
+        return ''.join(self.chunks)
+
+    def gcd_counts(self):
+        """gcd_occurences of the text so far."""
+        counts = {}
+        for _, gcd in self.sequences.values():
+            if gcd:
+                counts[gcd] = counts.get(gcd, 0) + 1
+        return counts
+
+    def kasiski_lengths(self):
+        """Key lengths ranked by the divisor votes of the trigram GCDs, as find_key_lengths gives them."""
+        return find_key_lengths(self.gcd_counts())
+
+    def ioc_lengths(self):
+        """ioc_key_lengths of the text so far."""
+        periods = max(1, min(self.max_key_length, self.length // 8))
+        return rank_iocs(counts_ioc(self.period_counts[:periods]))
+
+    def key_lengths(self):
+        """The key length ranking used by results(): Kasiski votes, IoC or both, by self.ranking."""
+        if self.ranking == 'ioc':
+            return self.ioc_lengths()
+        if self.ranking == 'combined':
+            return combined_key_lengths(self.kasiski_lengths(), self.ioc_lengths())
+        return self.kasiski_lengths()
+
+    def column_counts(self, key_length):
+        if key_length <= self.max_key_length:
+            return self.period_counts[key_length - 1]
+        return column_counts(self.text(), key_length)
+
+    def results(self, cache=None, instrument=None):
+        """kasiski_test of the text fed so far."""
+        instrument = instrument or NULL
+        ciphertext = Ciphertext(self.text())
+        cache = decrypt_cache(cache, ciphertext, self.score_fn)
+        misses, score_calls = cache.misses, cache.score_calls
+        with instrument:
+            with instrument.stage('key_lengths'):
+                potential_key_lengths = self.kasiski_lengths()
+            if not potential_key_lengths and self.fallback and self.ranking != 'ioc':
+                results = anneal_key_lengths(ciphertext, self.score_fn, self.frequencies, self.processes,
+                                             self.time_budget, cache=cache, instrument=instrument)
+            else:
+                results = _solve_key_lengths(ciphertext, potential_key_lengths, self.ranking, self.solver,
+                                             self.frequencies, cache, instrument, self.ioc_lengths,
+                                             self.column_counts)
+            instrument.count('decrypts', cache.misses - misses)
+            instrument.count('score_calls', cache.score_calls - score_calls)
+        return Results(results, instrument.summary())
+
+    def best(self):
+        """Best (key_length, key, plaintext, score) so far, None before any candidate."""
+        results = self.results()
+        return results[0] if results else None
+
+
+SPACE = 26  # un texte déchiffré ne contient que des lettres (0-25) et des espaces
+
+def _gram_code(gram):
+    code = 0
+    for char in gram:
+        code = code * 27 + ord(char) - ord('a')
+    return code
+
+def _gram_table(grams, n, points):
+    # points gagnés par chaque n-gramme, indexé par son code en base 27 (l'espace compte comme 26e lettre)
+    table = np.zeros(27 ** n, dtype=np.int64)
+    for gram in grams:
+        if len(gram) == n:  # 'ment' dans les trigrammes ne peut jamais correspondre
+            table[_gram_code(gram)] = points
+    return table
+
+def _word_code(word):
+    # chiffres 1-26 pour que deux mots de longueurs différentes n'aient pas le même code
+    code = 0
+    for char in word:
+        code = code * 27 + ord(char) - ord('a') + 1
+    return code
+
+MAX_WORD_LENGTH = 13  # 27**13 tient encore dans un int64
+
+@lru_cache(maxsize=None)
+def french_ngram_tables():
+    """Points of every French n-gram in base 27, built on first use (the 4-gram table is 4 MB)."""
+    return {2: _gram_table(FRENCH_COMMON_BIGRAMS, 2, 1),
+            3: _gram_table(FRENCH_COMMON_TRIGRAMS, 3, 3),
+            4: _gram_table(FRENCH_COMMON_QUADGRAMS, 4, 5)}
+
+FRENCH_WORD_CODES = np.array(sorted(_word_code(w) for w in FRENCH_COMMON_WORDS if len(w) <= MAX_WORD_LENGTH))
+WORD_POINTS = 10
+
+def _base27_table(table, n):
+    # la table base 26 d'un NgramScorer, l'espace (chiffre 26) ne forme aucun n-gramme
+    codes = np.zeros(26 ** n, dtype=np.int64)
+    for j in range(n):
+        codes = codes * 27 + (np.arange(26 ** n) // 26 ** (n - 1 - j)) % 26
+    result = np.zeros(27 ** n, dtype=np.result_type(table.dtype, np.float64) if table.dtype.kind == 'f' else np.int64)
+    result[codes] = table
+    return result
+
+@lru_cache(maxsize=8)
+def column_tables(scorer=None):
+    """(base-27 n-gram tables, sorted word codes, word points) of ColumnScorer for a scorer.
+
+    None or score_text_french gives the French list tables; an NgramScorer
+    gives its own tables and words. Other functions cannot be split into
+    n-grams and raise TypeError.
+    """
+    if scorer is None or scorer is score_text_french:
+        return french_ngram_tables(), FRENCH_WORD_CODES, WORD_POINTS
+    if not hasattr(scorer, 'tables'):
+        raise TypeError(f"ColumnScorer needs an NgramScorer or score_text_french, got {scorer!r}")
+    tables = {n: _base27_table(table, n) for n, table in scorer.tables.items()}
+    words = [w for w in scorer.words if len(w) <= MAX_WORD_LENGTH and all('a' <= c <= 'z' for c in w)]
+    return tables, np.array(sorted(_word_code(w) for w in words), dtype=np.int64), scorer.word_bonus
+
+
+class ColumnScorer:
+    """Score of a Vigenère decryption, updated one key column at a time.
+
+    Changing one key letter only changes the letters of one column, so only the
+    n-grams and words touching that column are rescored. The score is
+    score_text_french, or the score of an NgramScorer (see column_tables);
+    words are the runs of letters.
+    """
+
+    def __init__(self, encoded, key, scorer=None):
+        self.key = list(key)
+        self.shifts = [(ord(k) - ord('a')) % 26 for k in key]
+        text = np.full(encoded.length, SPACE, dtype=np.int64)
+        text[encoded.mask] = encoded.decrypt_letters(key)
+        self.text = text
+        n = len(text)
+
+        letter_positions = np.flatnonzero(encoded.mask)
+        self.columns = [letter_positions[c::len(key)] for c in range(len(key))]
+
+        # n-grammes: code et points de chaque fenetre
+        self.tables, self.known_words, self.word_bonus = column_tables(scorer)
+        self.dtype = np.result_type(np.int64, type(self.word_bonus), *self.tables.values())
+        self.codes = {}
+        self.points = {}
+        for size, table in self.tables.items():
+            starts = np.arange(max(n - size + 1, 0))
+            self.codes[size] = self._window_codes(starts, size)
+            self.points[size] = table[self.codes[size]]
+
+        # mots: suites de lettres, chaque lettre a sa valeur de position dans le code du mot
+        is_letter = text != SPACE
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], is_letter, [False])).astype(np.int8)))
+        word_starts, word_ends = edges[::2], edges[1::2]
+        self.word_valid = (word_ends - word_starts) <= MAX_WORD_LENGTH
+        self.word_of = np.where(is_letter, np.cumsum(np.isin(np.arange(n), word_starts)) - 1, -1)
+        self.place = np.zeros(n, dtype=np.int64)
+        self.word_codes = np.zeros(len(word_starts), dtype=np.int64)
+        if len(word_starts):
+            positions = np.flatnonzero(is_letter)
+            word = self.word_of[positions]
+            exponent = np.clip(word_ends[word] - 1 - positions, 0, MAX_WORD_LENGTH - 1)
+            self.place[positions] = np.where(self.word_valid[word], 27 ** exponent, 0)
+            self.word_codes = np.add.reduceat((text + 1) * self.place, word_starts)
+        self.word_points = self._word_points(self.word_codes, self.word_valid)
+
+        # ce qui touche chaque colonne, calculé une fois
+        self.links = []
+        for cols in self.columns:
+            windows = {}
+            for size, codes in self.codes.items():
+                starts = (cols[:, None] - np.arange(size)).ravel()
+                starts = np.unique(starts[(starts >= 0) & (starts < len(codes))])
+                groups = []
+                for j in range(size):
+                    # fenetres dont la lettre numéro j est dans la colonne
+                    ok = (cols - j >= 0) & (cols - j < len(codes))
+                    groups.append((np.searchsorted(starts, cols[ok] - j), np.flatnonzero(ok), 27 ** (size - 1 - j)))
+                windows[size] = (starts, groups)
+            words, local = np.unique(self.word_of[cols], return_inverse=True)
+            self.links.append((windows, words, local.ravel()))
+
+        self.score = self._total()
+
+    def _total(self):
+        return (sum(p.sum() for p in self.points.values()) + self.word_points.sum()).item()
+
+    def _window_codes(self, starts, size):
+        codes = np.zeros(len(starts), dtype=np.int64)
+        for j in range(size):
+            codes = codes * 27 + self.text[starts + j]
+        return codes
+
+    def _word_points(self, codes, valid):
+        known = self.known_words
+        if not len(known):
+            return np.zeros(codes.shape, dtype=self.dtype)
+        found = np.minimum(np.searchsorted(known, codes), len(known) - 1)
+        return np.where(valid & (known[found] == codes), self.word_bonus, 0).astype(self.dtype)
+
+    def column_deltas(self, column):
+        """Score change for each of the 26 letters at key position `column` (0 for the current one)."""
+        cols = self.columns[column]
+        windows, words, local = self.links[column]
+        old = self.text[cols]
+        shift = (self.shifts[column] - np.arange(26)) % 26  # p = c - k
+        diff = (old[None, :] + shift[:, None]) % 26 - old[None, :]
+        deltas = np.zeros(26, dtype=self.dtype)
+
+        for size, (starts, groups) in windows.items():
+            codes = np.repeat(self.codes[size][starts][None, :], 26, axis=0)
+            for window, col, place in groups:
+                codes[:, window] += diff[:, col] * place
+            deltas += self.tables[size][codes].sum(axis=1) - self.points[size][starts].sum()
+
+        if len(cols):
+            codes = np.repeat(self.word_codes[words][None, :], 26, axis=0)
+            rows = np.arange(26)[:, None] * len(words) + local[None, :]
+            np.add.at(codes.ravel(), rows.ravel(), (diff * self.place[cols][None, :]).ravel())
+            deltas += self._word_points(codes, self.word_valid[words]).sum(axis=1) - self.word_points[words].sum()
+
+        return deltas
+
+    def set_letter(self, column, letter):
+        """Change the key letter at `column` and update the cached contributions."""
+        cols = self.columns[column]
+        windows, words, _ = self.links[column]
+        shift = (self.shifts[column] - letter) % 26
+        old = self.text[cols]
+        new = (old + shift) % 26
+        self.text[cols] = new
+
+        for size, (starts, _) in windows.items():
+            self.codes[size][starts] = self._window_codes(starts, size)
+            self.points[size][starts] = self.tables[size][self.codes[size][starts]]
+
+        np.add.at(self.word_codes, self.word_of[cols], (new - old) * self.place[cols])
+        self.word_points[words] = self._word_points(self.word_codes[words], self.word_valid[words])
+
+        self.shifts[column] = letter
+        self.key[column] = chr(letter + ord('a'))
+        self.score = self._total()
+
+
+#tester des variations de la clé, for the highest scores
+def try_key_variations(ciphertext, base_key, max_passes=None, scorer=None, cache=None, instrument=None):
+    """Hill climbing on single letter changes of base_key, as (key, plaintext, score).
+
+    scorer is score_text_french (None) or an NgramScorer, see ColumnScorer.
+    """
+    instrument = instrument or NULL
+    # le cache ne sert qu'au dechiffrement final, son scorer n'importe pas
+    cache = decrypt_cache(cache, ciphertext)
+    encoded = cache.encoded
+    with instrument, instrument.stage('variations'):
+        return _try_key_variations(encoded, cache, base_key, max_passes, scorer, instrument)
+
+def _try_key_variations(encoded, cache, base_key, max_passes, score_fn, instrument):
+    scorer = ColumnScorer(encoded, base_key, score_fn)
+    best_score = scorer.score  # Start with current score
+    
+    instrument.message("Starting with key: {}, score: {}", base_key, best_score)
+    instrument.message("Trying variations...")
+    
+    # hill climbing: à chaque passe on garde le meilleur changement d'une lettre, jusqu'à ce que plus rien n'améliore
+    passes = 0
+    while max_passes is None or passes < max_passes:
+        passes += 1
+        best_move = None
+        best_gain = 0
+        for pos in range(len(base_key)):
+            deltas = scorer.column_deltas(pos)
+            instrument.count('candidates', 26)
+            letter = int(np.argmax(deltas))
+            if deltas[letter] > best_gain:
+                best_gain = deltas[letter].item()
+                best_move = (pos, letter)
+        
+        if best_move is None:
+            break
+        scorer.set_letter(*best_move)
+        best_score = scorer.score
+        instrument.count('passes')
+        instrument.event('variation', key=''.join(scorer.key), score=best_score)
+        instrument.message("Improved key: {}, score: {}", ''.join(scorer.key), best_score)
+    
+    best_key = ''.join(scorer.key)
+    best_plaintext = cache.decrypt(best_key)
+    
+    if best_key == base_key:
+        instrument.message("No improvement found with simple variations.")
+    else:
+        instrument.message("Best variation found: {}, score: {}", best_key, best_score)
+        instrument.message("Decryption sample: {}...", best_plaintext[:100])
+    
+    return best_key, best_plaintext, best_score
+
+
+if __name__ == "__main__":
+    ciphertext = "VDFKDQWTXHLOFKLIIUHPHQWGXPRWFKLIIUHPHQWDYHFORPHPHFOHGRQQHOHFKLIIUHPYWIUWTHDOYGHFUBSWHXUSDUWLHOOHPHQWOHVTXDWKUHSUHPLHUVFDUDFWHUHVVXIILURQWOHWHAWHSVXLYDQWTXLDHWHREWHQXHQDSSOLTXDQWOHFKLIIUHPHQWGHKLOOVXUGHVEORFCVGWDLOOHGHXDVXUXQPRWGHPRODQJXHIUDQFDLVHJCDWCAMLKYEUHRVX"
+    cache = DecryptCache(ciphertext, score_text_french)  # partage entre kasiski_test et try_key_variations
+    instrument = Instrument(callback=print_events)
+    results = kasiski_test(ciphertext, cache=cache, instrument=instrument)
+    
+    print("\n===== FINAL RESULTS =====")
+    for key_length, key, plaintext, score in results:
+        print(f"\nKey length: {key_length}")
+        print(f"Key: {key}")
+        print(f"Score: {score}")
+        print(f"Decryption sample: {plaintext[:200]}")
+        print("-" * 50)
+    
+    if results:
+        # Get the best key from top result
+        top_key_length, top_key, top_plaintext, top_score = results[0]
+        print("\n===== TRYING KEY VARIATIONS =====")
+        best_key2, best_plaintext2, best_score2 = try_key_variations(ciphertext, top_key, scorer=cache.score_fn,
+                                                                     cache=cache, instrument=instrument)
+        print(f"Decrypt cache: {cache.stats()}")
+        
+        print("\n===== FINAL BEST RESULT =====")
+        print(f"Original key: {top_key}, score: {top_score}")
+        print(f"Improved key: {best_key2}, score: {best_score2}")
+        if best_score2 > top_score:
+            print("Found better key through variations!")
+            print(f"Decryption with improved key: {best_plaintext2[:200]}")
+        else:
+            print("Original key was already optimal.")
+    else:
+        print("No results found from Kasiski test.")
+    
+    print("\n===== INSTRUMENTATION =====")
+    print(instrument.to_json(indent=2))
\ No newline at end of file
@@ -0,0 +1,180 @@
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .ngram_scorer import NgramScorer, _encode, get_scorer as builtin_scorer
+
+# format du fichier: en-tete, une entree par ordre n, puis les tableaux float32 de log-probabilites
+MAGIC = b'NGLM'
+VERSION = 1
+HEADER = struct.Struct('<4sHH8s')      # magic, version, ordre max, code de langue
+ORDER_ENTRY = struct.Struct('<QQ')     # nombre de n-grammes comptés, offset du tableau
+ALIGNMENT = 64
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+
+def count_ngrams(chunks, max_n=4):
+    """Count the 1- to max_n-grams of a stream of text chunks, n-grams never cross a non-letter."""
+    counts = {n: np.zeros(26 ** n, dtype=np.int64) for n in range(1, max_n + 1)}
+    carry = ''
+
+    for chunk in chunks:
+        # les n-1 derniers caracteres du bloc precedent, pour les n-grammes a cheval
+        text = carry + chunk
+        letters, is_letter = _encode(text)
+        breaks = np.concatenate(([0], np.cumsum(~is_letter)))
+        first = len(carry)
+        for n, table in counts.items():
+            # fenetres qui finissent dans le nouveau bloc seulement, pour ne rien compter deux fois
+            start = max(first - n + 1, 0)
+            count = len(letters) - n + 1 - start
+            if count <= 0:
+                continue
+            codes = np.zeros(count, dtype=np.int64)
+            for j in range(n):
+                codes = codes * 26 + letters[start + j:start + j + count]
+            valid = breaks[start + n:start + n + count] == breaks[start:start + count]
+            table += np.bincount(codes[valid], minlength=26 ** n)
+        carry = text[-(max_n - 1):] if max_n > 1 else ''
+
+    return counts
+
+
+def read_corpus(paths, block_size=1 << 20):
+    """Text blocks of one or more corpus files, read lazily."""
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for block in iter(lambda: f.read(block_size), ''):
+                yield block
+        yield '\n'  # un fichier ne continue pas le suivant
+
+
+def log_probabilities(counts, alpha=0.5):
+    """Smoothed log-probabilities (float32) of each n-gram from its counts."""
+    total = counts.sum()
+    return np.log((counts + alpha) / (total + alpha * len(counts))).astype(np.float32)
+
+
+def save_model(path, language, counts, alpha=0.5):
+    """Write a model file: header, per-order entries, aligned float32 log-probability arrays."""
+    orders = sorted(counts)
+    if orders != list(range(1, len(orders) + 1)):
+        raise ValueError("counts must hold every order from 1 to max_n")
+
+    offset = HEADER.size + ORDER_ENTRY.size * len(orders)
+    entries = []
+    for n in orders:
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        entries.append((int(counts[n].sum()), offset))
+        offset += 4 * 26 ** n
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(orders), language.encode('ascii')))
+        for entry in entries:
+            f.write(ORDER_ENTRY.pack(*entry))
+        for n, (_, start) in zip(orders, entries):
+            f.write(b'\0' * (start - f.tell()))
+            f.write(log_probabilities(counts[n], alpha).astype('<f4').tobytes())
+    os.replace(tmp, path)
+
+
+def train(paths, language, out_path, max_n=4, alpha=0.5):
+    """Count the n-grams of corpus files and save the model, returns the number of letters seen."""
+    counts = count_ngrams(read_corpus(paths), max_n)
+    save_model(out_path, language, counts, alpha)
+    return int(counts[1].sum())
+
+
+class LanguageModel:
+    """A model file mapped in memory, its tables are read-only views shared between processes."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, max_n, language = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} n-gram model")
+
+        self.path = path
+        self.language = language.rstrip(b'\0').decode('ascii')
+        self.max_n = max_n
+        self.totals = {}
+        self.tables = {}
+        for n in range(1, max_n + 1):
+            total, offset = ORDER_ENTRY.unpack_from(self._mmap, HEADER.size + ORDER_ENTRY.size * (n - 1))
+            self.totals[n] = total
+            self.tables[n] = np.frombuffer(self._mmap, dtype='<f4', count=26 ** n, offset=offset)
+
+    def scorer(self, orders=None, words=(), word_bonus=10):
+        """NgramScorer over the tables of the given orders (the highest order by default)."""
+        if orders is None:
+            orders = (self.max_n,)
+        return NgramScorer({n: self.tables[n] for n in orders}, words, word_bonus)
+
+
+# langue -> chemin du fichier, et modeles deja ouverts dans ce processus
+_registry = {}
+_loaded = {}
+
+
+def register_model(language, path):
+    _registry[language] = path
+    _loaded.pop(language, None)
+
+
+def model_path(language):
+    """Registered path for a language, else models/<language>.nglm next to this module."""
+    return _registry.get(language, os.path.join(MODELS_DIR, f'{language}.nglm'))
+
+
+def get_model(language):
+    """Model for a language code, opened once per process."""
+    if language not in _loaded:
+        path = model_path(language)
+        if not os.path.exists(path):
+            raise ValueError(f"no model for language {language!r} (looked for {path})")
+        _loaded[language] = LanguageModel(path)
+    return _loaded[language]
+
+
+def get_scorer(language):
+    """Trained model scorer for a language if one exists, else the built-in list scorer."""
+    if os.path.exists(model_path(language)):
+        return get_model(language).scorer()
+    return builtin_scorer(language)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="n-gram language models")
+    commands = parser.add_subparsers(dest='command', required=True)
+    train_cmd = commands.add_parser('train')
+    train_cmd.add_argument('--language', required=True)
+    train_cmd.add_argument('--out', required=True)
+    train_cmd.add_argument('--max-n', type=int, default=4)
+    train_cmd.add_argument('corpus', nargs='+')
+    info_cmd = commands.add_parser('info')
+    info_cmd.add_argument('model')
+    args = parser.parse_args(argv)
+
+    if args.command == 'train':
+        start = time.perf_counter()
+        letters = train(args.corpus, args.language, args.out, args.max_n)
+        print(f"{args.out}: {letters} letters counted in {time.perf_counter() - start:.2f}s")
+    else:
+        start = time.perf_counter()
+        model = LanguageModel(args.model)
+        elapsed = time.perf_counter() - start
+        print(f"language {model.language}, orders 1-{model.max_n}, loaded in {elapsed * 1000:.2f} ms")
+        for n, total in model.totals.items():
+            print(f"  {n}-grams: {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .frequency_analysis import ENGLISH_COMMON_WORDS, ENGLISH_COMMON_BIGRAMS, ENGLISH_LETTER_FREQUENCIES
+from .frequency_analysis_french import (FRENCH_COMMON_WORDS, FRENCH_COMMON_BIGRAMS, FRENCH_LETTER_FREQUENCIES,
+                                       FRENCH_COMMON_TRIGRAMS, FRENCH_COMMON_QUADGRAMS)
+
+
+def gram_code(gram):
+    """Base-26 integer of an n-gram of lowercase letters."""
+    code = 0
+    for char in gram:
+        code = code * 26 + ord(char) - ord('a')
+    return code
+
+
+def _encode(text):
+    # lettres a-z -> 0-25, tout le reste coupe les n-grammes
+    codes = np.frombuffer(text.lower().encode('utf-32-le'), dtype=np.uint32)
+    is_letter = (codes >= ord('a')) & (codes <= ord('z'))
+    letters = np.where(is_letter, codes.astype(np.int64) - ord('a'), 0)
+    return letters, is_letter
+
+
+class NgramScorer:
+    """Text scorer from dense n-gram tables and a word set.
+
+    tables[n] holds a value (log-probability or points) for each of the 26**n
+    n-grams, indexed by gram_code(). Only n-grams made of letters a-z count.
+    Every word of `words` adds `word_bonus`.
+    """
+
+    def __init__(self, tables, words=(), word_bonus=10):
+        # pas de copie: les tables peuvent etre des vues float32 sur un fichier mmap
+        self.tables = {n: np.asarray(table) for n, table in tables.items()}
+        for n, table in self.tables.items():
+            if len(table) != 26 ** n:
+                raise ValueError(f"table for n={n} must have 26**{n} entries")
+        self.words = frozenset(words)
+        self.word_bonus = word_bonus
+
+    @classmethod
+    def from_lists(cls, ngram_points, words=(), word_bonus=10):
+        """Scorer giving fixed points to listed n-grams, e.g. {2: (['th', 'he'], 1)}."""
+        tables = {}
+        for n, (grams, points) in ngram_points.items():
+            table = tables.setdefault(n, np.zeros(26 ** n))
+            for gram in grams:
+                if len(gram) == n:  # un n-gramme de la mauvaise longueur ne peut jamais correspondre
+                    table[gram_code(gram)] = points
+        return cls(tables, words, word_bonus)
+
+    def _ngram_scores(self, letters, is_letter):
+        # score de chaque position de depart, toutes les tailles de n-grammes en une passe
+        total = np.zeros(len(letters))
+        breaks = np.concatenate(([0], np.cumsum(~is_letter)))
+        for n, table in self.tables.items():
+            count = len(letters) - n + 1
+            if count <= 0:
+                continue
+            codes = np.zeros(count, dtype=np.int64)
+            for j in range(n):
+                codes = codes * 26 + letters[j:j + count]
+            valid = breaks[n:n + count] == breaks[:count]
+            total[:count] += np.where(valid, table[codes], 0.0)
+        return total
+
+    def _word_score(self, text):
+        if not self.words:
+            return 0
+        return self.word_bonus * sum(1 for word in text.lower().split() if word in self.words)
+
+    def score(self, text):
+        letters, is_letter = _encode(text)
+        return float(self._ngram_scores(letters, is_letter).sum()) + self._word_score(text)
+
+    def score_many(self, texts):
+        """Scores of many texts, their n-grams are gathered in a single vectorized pass."""
+        texts = list(texts)
+        if not texts:
+            return []
+        # un separateur entre les textes pour qu'aucun n-gramme ne les relie
+        letters, is_letter = _encode('\n'.join(texts))
+        per_position = self._ngram_scores(letters, is_letter)
+        lengths = np.array([len(text.lower()) for text in texts])
+        starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+        # le separateur ne compte jamais (il casse les n-grammes), le 0 ajoute evite un debut hors tableau
+        sums = np.add.reduceat(np.append(per_position, 0.0), starts)
+        return [float(s) + self._word_score(text) for s, text in zip(sums.tolist(), texts)]
+
+    def __call__(self, text):
+        return self.score(text)
+
+
+@lru_cache(maxsize=None)
+def english_scorer():
+    """Same scores as frequency_analysis.score_text."""
+    return NgramScorer.from_lists({2: (ENGLISH_COMMON_BIGRAMS, 1)}, ENGLISH_COMMON_WORDS)
+
+
+@lru_cache(maxsize=None)
+def french_scorer():
+    """Same scores as frequency_analysis_french.score_text_french on lowercase text.
+
+    score_text_french lowercases its words and bigrams but not its trigrams and
+    quadgrams, this scorer lowercases everything: on text with capitals it also
+    counts 'ENT' or 'TION' ("LES ENFANTS DE LA PATRIE": 42 against 36). The
+    crackers only score lowercase decryptions.
+    """
+    return NgramScorer.from_lists({2: (FRENCH_COMMON_BIGRAMS, 1),
+                                   3: (FRENCH_COMMON_TRIGRAMS, 3),
+                                   4: (FRENCH_COMMON_QUADGRAMS, 5)}, FRENCH_COMMON_WORDS)
+
+
+SCORERS = {'en': english_scorer, 'fr': french_scorer}
+LANGUAGE_FREQUENCIES = {'en': ENGLISH_LETTER_FREQUENCIES, 'fr': FRENCH_LETTER_FREQUENCIES}
+
+
+def get_scorer(language):
+    """Scorer for a language code ('en', 'fr')."""
+    try:
+        return SCORERS[language]()
+    except KeyError:
+        raise ValueError(f"no scorer for language {language!r}") from None
@@ -0,0 +1,94 @@
+import numpy as np
+
+
+def _as_keys(keys):
+    keys = np.asarray(keys, dtype=np.uint8)
+    if keys.ndim != 2 or keys.shape[1] == 0:
+        raise ValueError("keys must be a (n_keys, key_len) array with key_len > 0")
+    return keys
+
+
+def batch_KSA(keys):
+    """Run the RC4 key schedule for every row of a (n_keys, key_len) uint8 array."""
+    keys = _as_keys(keys)
+    n_keys, key_length = keys.shape
+    rows = np.arange(n_keys)
+    S = np.tile(np.arange(256, dtype=np.uint8), (n_keys, 1))
+    j = np.zeros(n_keys, dtype=np.intp)
+
+    # i est le meme pour toutes les clés, seul j change d'une ligne à l'autre
+    for i in range(256):
+        si = S[:, i].astype(np.intp)
+        j = (j + si + keys[:, i % key_length]) & 0xFF
+        S[:, i] = S[rows, j]
+        S[rows, j] = si
+
+    return S
+
+
+def batch_PRGA(S, data_length):
+    """Keystream matrix (n_keys, data_length) for the states S, which are updated in place."""
+    n_keys = S.shape[0]
+    rows = np.arange(n_keys)
+    keystream = np.empty((n_keys, data_length), dtype=np.uint8)
+    i = 0
+    j = np.zeros(n_keys, dtype=np.intp)
+
+    for k in range(data_length):
+        i = (i + 1) & 0xFF
+        a = S[:, i].astype(np.intp)
+        j = (j + a) & 0xFF
+        b = S[rows, j].astype(np.intp)
+        S[:, i] = b
+        S[rows, j] = a
+        keystream[:, k] = S[rows, (a + b) & 0xFF]
+
+    return keystream
+
+
+def batch_keystream(keys, data_length):
+    """First `data_length` keystream bytes for each key, same bytes as PRGA(KSA(key), ...)."""
+    return batch_PRGA(batch_KSA(keys), data_length)
+
+
+class KeystreamHistogram:
+    """Per-position byte counts of the RC4 keystream, accumulated batch after batch."""
+
+    def __init__(self, data_length):
+        self.data_length = data_length
+        self.counts = np.zeros((data_length, 256), dtype=np.int64)
+        self.n_keys = 0
+
+    def update(self, keys):
+        keystream = batch_keystream(keys, self.data_length)
+        # une seule bincount sur (position, octet) pour tout le lot
+        index = np.arange(self.data_length) * 256 + keystream.astype(np.intp)
+        self.counts += np.bincount(index.ravel(), minlength=self.data_length * 256).reshape(self.data_length, 256)
+        self.n_keys += keystream.shape[0]
+
+    def frequencies(self):
+        """Probability of each byte value at each keystream position."""
+        if self.n_keys == 0:
+            return np.zeros((self.data_length, 256))
+        return self.counts / self.n_keys
+
+
+def keystream_histogram(n_keys, key_length, data_length, batch_size=65536, seed=None):
+    """Histogram of the first `data_length` keystream bytes over `n_keys` random keys."""
+    rng = np.random.default_rng(seed)
+    histogram = KeystreamHistogram(data_length)
+    done = 0
+
+    while done < n_keys:
+        size = min(batch_size, n_keys - done)
+        histogram.update(rng.integers(0, 256, size=(size, key_length), dtype=np.uint8))
+        done += size
+
+    return histogram
+
+
+if __name__ == "__main__":
+    # biais du deuxième octet: Z2 = 0 avec une probabilité proche de 2/256
+    histogram = keystream_histogram(200000, 16, 2, seed=0)
+    freq = histogram.frequencies()
+    print(f"P(Z2 = 0) = {freq[1, 0]:.5f} (expected ~{2 / 256:.5f}, uniform {1 / 256:.5f})")
@@ -0,0 +1,196 @@
+import json
+import multiprocessing
+import os
+import time
+
+from .RC4 import KSA, _as_buffer
+
+# etat de chaque worker, initialisé une seule fois par processus
+_charset = None
+_expected = None
+_min_length = None
+
+
+def key_space_size(charset, min_length, max_length):
+    return sum(len(charset) ** length for length in range(min_length, max_length + 1))
+
+
+def index_to_key(charset, min_length, index):
+    """The key at position `index` of the search order (shorter keys first)."""
+    length = min_length
+    while index >= len(charset) ** length:
+        index -= len(charset) ** length
+        length += 1
+
+    digits = []
+    for _ in range(length):
+        index, d = divmod(index, len(charset))
+        digits.append(d)
+    return [charset[d] for d in reversed(digits)]
+
+
+def _next_key(charset, key):
+    # incrémente la clé comme un compteur, puis passe à la longueur suivante
+    for pos in range(len(key) - 1, -1, -1):
+        d = charset.index(key[pos]) + 1
+        if d < len(charset):
+            key[pos] = charset[d]
+            return key
+        key[pos] = charset[0]
+    return key + [charset[0]]
+
+
+def keystream_matches(key, expected):
+    """True if the RC4 keystream of key starts with expected, stops at the first wrong byte."""
+    S = KSA(key)
+    i = 0
+    j = 0
+    for byte in expected:
+        i = (i + 1) & 0xFF
+        a = S[i]
+        j = (j + a) & 0xFF
+        b = S[j]
+        S[i] = b
+        S[j] = a
+        if S[(a + b) & 0xFF] != byte:
+            return False
+    return True
+
+
+def _init_worker(charset, expected, min_length):
+    global _charset, _expected, _min_length
+    _charset = charset
+    _expected = expected
+    _min_length = min_length
+
+
+def _search_block(block):
+    start, stop = block
+    begin = time.perf_counter()
+    key = index_to_key(_charset, _min_length, start)
+    found = None
+    tested = 0
+
+    for _ in range(start, stop):
+        tested += 1
+        if keystream_matches(key, _expected):
+            found = bytes(key)
+            break
+        key = _next_key(_charset, key)
+
+    return start, found, tested, time.perf_counter() - begin, os.getpid()
+
+
+def _load_checkpoint(path, params):
+    if not path or not os.path.exists(path):
+        return 0, None
+    with open(path) as f:
+        state = json.load(f)
+    if state.get('params') != params:
+        raise ValueError(f"checkpoint {path} was written for a different search")
+    return state['next'], state.get('found')
+
+
+def _save_checkpoint(path, params, next_index, found):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'params': params, 'next': next_index, 'found': found}, f)
+    os.replace(tmp, path)  # jamais de checkpoint à moitié écrit
+
+
+def search_key(plaintext, ciphertext, charset, min_length, max_length,
+               processes=None, block_size=20000, checkpoint=None, report_every=5.0, report=None):
+    """Find a key in charset^[min_length..max_length] that maps plaintext to ciphertext.
+
+    A repeated character of charset counts once. report(done, total, rates)
+    is called every report_every seconds and once at the end, rates maps each
+    worker pid to [keys tested, seconds spent].
+    """
+    plaintext = bytes(_as_buffer(plaintext))
+    ciphertext = bytes(_as_buffer(ciphertext))
+    expected = bytes(p ^ c for p, c in zip(plaintext, ciphertext))
+    if not expected:
+        raise ValueError("need at least one byte of known plaintext")
+    charset_bytes = charset.encode() if isinstance(charset, str) else bytes(charset)
+    # un caractere en double ferait boucler _next_key sur sa premiere occurrence
+    charset_bytes = bytes(dict.fromkeys(charset_bytes))
+
+    params = {'keystream': expected.hex(), 'charset': charset_bytes.hex(),
+              'min_length': min_length, 'max_length': max_length}
+    total = key_space_size(charset_bytes, min_length, max_length)
+    next_index, found = _load_checkpoint(checkpoint, params)
+    if found is not None:
+        return bytes.fromhex(found)
+
+    blocks = ((start, min(start + block_size, total)) for start in range(next_index, total, block_size))
+    rates = {}
+    last_report = time.perf_counter()
+
+    with multiprocessing.Pool(processes, _init_worker, (charset_bytes, expected, min_length)) as pool:
+        # imap garde l'ordre des blocs, donc 'next' est toujours un point de reprise sûr
+        for start, key, tested, elapsed, pid in pool.imap(_search_block, blocks):
+            worker = rates.setdefault(pid, [0, 0.0])
+            worker[0] += tested
+            worker[1] += elapsed
+            next_index = start + tested
+
+            if key is not None:
+                found = key
+                if checkpoint:
+                    _save_checkpoint(checkpoint, params, next_index, key.hex())
+                pool.terminate()
+                break
+
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                last_report = now
+                if checkpoint:
+                    _save_checkpoint(checkpoint, params, next_index, None)
+                if report:
+                    report(next_index, total, rates)
+
+    if found is None:
+        next_index = total
+        if checkpoint:
+            _save_checkpoint(checkpoint, params, total, None)
+    if report:
+        report(next_index, total, rates)
+
+    return found
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RC4 known-plaintext key search")
+    parser.add_argument('--plaintext', required=True)
+    parser.add_argument('--ciphertext-hex', required=True)
+    parser.add_argument('--charset', default='abcdefghijklmnopqrstuvwxyz')
+    parser.add_argument('--min-length', type=int, default=1)
+    parser.add_argument('--max-length', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--block-size', type=int, default=20000)
+    parser.add_argument('--checkpoint')
+    args = parser.parse_args(argv)
+
+    last_rates = {}
+
+    def report(done, total, rates):
+        last_rates.update(rates)
+        print(f"{done}/{total} keys ({100 * done / total:.1f}%)")
+        for p, (n, t) in sorted(rates.items()):
+            print(f"  worker {p}: {n / t if t else 0:.0f} keys/s")
+
+    key = search_key(args.plaintext, bytes.fromhex(args.ciphertext_hex), args.charset,
+                     args.min_length, args.max_length, args.workers, args.block_size, args.checkpoint,
+                     report=report)
+    for p, (n, t) in sorted(last_rates.items()):
+        print(f"worker {p}: {n} keys, {n / t if t else 0:.0f} keys/s")
+    if key is None:
+        print("key not found")
+    else:
+        print(f"key found: {key.decode(errors='replace')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+class LetterTable(dict):
+    """str.translate table for a 26-letter substitution.
+
+    `mapping[i]` is the new index of the i-th letter. Letters outside a-z
+    (accents...) are mapped like the loops did, through their ord() - ord('a')
+    modulo 26, and added to the table the first time they are seen. Other
+    characters are kept, or replaced by `other` when it is given.
+    """
+
+    def __init__(self, mapping, other=None):
+        super().__init__()
+        self.mapping = mapping
+        self.other = other
+        for i in range(26):
+            self[ord('a') + i] = chr(mapping[i] + ord('a'))
+
+        # meme table pour bytes.translate, le texte est deja en minuscules
+        table = bytearray(range(256))
+        for i in range(256):
+            if ord('a') <= i <= ord('z'):
+                table[i] = mapping[i - ord('a')] + ord('a')
+            elif other is not None:
+                table[i] = ord(other)
+        self.bytes_table = bytes(table)
+
+    def __missing__(self, code):
+        char = chr(code)
+        if char.isalpha():
+            value = chr(self.mapping[(code - ord('a')) % 26] + ord('a'))
+        elif self.other is not None:
+            value = self.other
+        else:
+            value = char
+        self[code] = value
+        return value
+
+
+def translate(text, table):
+    """Apply a LetterTable to a str or to bytes."""
+    if isinstance(text, (bytes, bytearray)):
+        return text.translate(table.bytes_table)
+    return text.translate(table)
@@ -0,0 +1,100 @@
+import numpy as np
+
+
+def suffix_array(codes):
+    """Suffix array of an integer sequence by prefix doubling.
+
+    Also returns the rank arrays of every doubling step: levels[L][i] is the
+    rank of the 2**L symbols starting at i, which lcp_array() reuses.
+    """
+    codes = np.asarray(codes)
+    n = len(codes)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), []
+
+    _, rank = np.unique(codes, return_inverse=True)
+    rank = rank.astype(np.int64)
+    sa = np.argsort(rank)
+    levels = [rank.astype(np.int32)]
+    k = 1
+
+    while rank[sa[-1]] < n - 1:  # tant que deux suffixes ont le meme rang
+        second = np.zeros(n, dtype=np.int64)
+        second[:n - k] = rank[k:] + 1  # 0 = apres la fin du texte
+        key = rank * (n + 1) + second
+        sa = np.argsort(key)
+        sorted_key = key[sa]
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[sa[0]] = 0
+        new_rank[sa[1:]] = np.cumsum(sorted_key[1:] != sorted_key[:-1])
+        rank = new_rank
+        levels.append(rank.astype(np.int32))
+        k *= 2
+
+    return sa, levels
+
+
+def lcp_array(sa, levels):
+    """lcp[i] = length of the common prefix of the suffixes sa[i] and sa[i + 1]."""
+    n = len(sa)
+    if n < 2:
+        return np.empty(0, dtype=np.int64)
+
+    p = sa[:-1]
+    q = sa[1:]
+    lcp = np.zeros(n - 1, dtype=np.int64)
+
+    # on avance de 2**L tant que les blocs sont egaux, du plus grand au plus petit
+    for L in range(len(levels) - 1, -1, -1):
+        a = p + lcp
+        b = q + lcp
+        ok = (a < n) & (b < n)
+        same = np.zeros(n - 1, dtype=bool)
+        same[ok] = levels[L][a[ok]] == levels[L][b[ok]]
+        lcp[same] += 1 << L
+
+    return lcp
+
+
+class RepeatIndex:
+    """Suffix array and LCP array of a sequence, to find its repeated substrings."""
+
+    def __init__(self, codes):
+        self.codes = np.asarray(codes)
+        self.sa, levels = suffix_array(self.codes)
+        self.lcp = lcp_array(self.sa, levels)
+
+    def maximal_repeats(self, min_length=3):
+        """All maximal repeats of length >= min_length as (length, sorted positions)."""
+        sa = self.sa
+        lcp = self.lcp
+        if len(lcp) == 0:
+            return []
+
+        # caractere qui precede chaque suffixe, -1 pour le suffixe 0 (toujours different)
+        before = np.full(len(sa), -1, dtype=np.int64)
+        before[sa > 0] = self.codes[sa[sa > 0] - 1]
+        changes = np.concatenate(([0], np.cumsum(before[1:] != before[:-1])))
+
+        # les intervalles de lcp >= min_length sont dans des suites consecutives de lcp >= min_length
+        long_enough = np.concatenate(([False], lcp >= min_length, [False]))
+        edges = np.flatnonzero(long_enough[1:] != long_enough[:-1])
+        repeats = []
+
+        for start, stop in zip(edges[::2].tolist(), edges[1::2].tolist()):
+            values = lcp[start:stop].tolist()
+            stack = []  # (lcp, borne gauche) des intervalles ouverts
+
+            for offset, value in enumerate(values + [0]):
+                i = start + offset
+                lb = i
+                while stack and stack[-1][0] > value:
+                    length, lb = stack.pop()
+                    # intervalle [lb, i] dans le suffix array: repetition maximale a droite,
+                    # maximale a gauche si les caracteres precedents ne sont pas tous egaux
+                    if changes[i] - changes[lb] > 0:
+                        repeats.append((length, np.sort(sa[lb:i + 1])))
+                if value >= min_length and (not stack or stack[-1][0] < value):
+                    stack.append((value, lb))
+
+        return repeats
@@ -0,0 +1,182 @@
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from .ngram_scorer import LANGUAGE_FREQUENCIES
+from .instrument import NULL
+from .language_model import get_scorer
+from .vigenere_cipher import encode
+
+START_TEMPERATURE = 2.0
+END_TEMPERATURE = 0.02
+
+# etat de chaque worker, initialisé une seule fois par processus
+_letters = None
+_tables = None
+_seed = None
+_sweeps = None
+
+
+def anneal_tables(scorer, frequencies):
+    """Base-26 n-gram tables of the annealing score.
+
+    The scorer's tables, plus letter log-frequencies when it has no 1-gram
+    table: the list scorers give points to a few n-grams only, a short text
+    would leave most keys with the same score.
+    """
+    tables = dict(scorer.tables)
+    if 1 not in tables:
+        frequencies = np.asarray(frequencies, dtype=float)
+        tables[1] = np.log(frequencies / frequencies.sum())
+    return tables
+
+
+def column_scores(letters, shifts, column, tables):
+    """Score of the decrypted letters for each of the 26 shifts at key position `column`."""
+    key_length = len(shifts)
+    plain = (letters - np.resize(shifts, len(letters))) % 26
+    candidates = np.repeat(plain[None, :], 26, axis=0)
+    candidates[:, column::key_length] = (letters[None, column::key_length] - np.arange(26)[:, None]) % 26
+    scores = np.zeros(26)
+    for n, table in tables.items():
+        count = len(letters) - n + 1
+        if count <= 0:
+            continue
+        codes = np.zeros((26, count), dtype=np.int64)
+        for j in range(n):
+            codes = codes * 26 + candidates[:, j:j + count]
+        scores += table[codes].sum(axis=1)
+    return scores
+
+
+def anneal_key(letters, key_length, tables, rng, sweeps=100, deadline=None):
+    """One annealing run from a random key, returns (score, shifts).
+
+    Each step redraws one key letter from the Boltzmann distribution of its 26
+    scores (heat bath), the temperature falls geometrically over the sweeps,
+    then a greedy pass keeps the best letter of each column until nothing changes.
+    """
+    shifts = rng.integers(0, 26, key_length)
+    temperatures = np.geomspace(START_TEMPERATURE, END_TEMPERATURE, sweeps)
+    for temperature in temperatures:
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        for column in rng.permutation(key_length).tolist():
+            scores = column_scores(letters, shifts, column, tables)
+            weights = np.exp((scores - scores.max()) / temperature)
+            shifts[column] = rng.choice(26, p=weights / weights.sum())
+
+    improved = True
+    while improved:
+        improved = False
+        for column in range(key_length):
+            scores = column_scores(letters, shifts, column, tables)
+            best = int(np.argmax(scores))
+            if scores[best] > scores[shifts[column]]:
+                shifts[column] = best
+                improved = True
+    score = float(column_scores(letters, shifts, 0, tables)[shifts[0]])
+    return score, tuple(shifts.tolist())
+
+
+def _init_worker(letters, tables, seed, sweeps):
+    global _letters, _tables, _seed, _sweeps
+    _letters = letters
+    _tables = tables
+    _seed = seed
+    _sweeps = sweeps
+
+
+def _restart(task):
+    key_length, index, deadline = task
+    # la graine ne depend que du numero de la relance: memes resultats quel que soit le nombre de workers
+    rng = np.random.default_rng([_seed, key_length, index])
+    return anneal_key(_letters, key_length, _tables, rng, _sweeps, deadline)
+
+
+def _best_of(results, agree, deadline):
+    best = None
+    votes = {}
+    done = 0
+    for score, shifts in results:
+        done += 1
+        votes[shifts] = votes.get(shifts, 0) + 1
+        if best is None or score > best[0]:
+            best = (score, shifts)
+        # arret des que `agree` relances ont trouve la meilleure cle, ou quand le temps est ecoule
+        if votes[best[1]] >= agree or time.monotonic() > deadline:
+            break
+    return best, done
+
+
+class Annealer:
+    """Annealing searches on one ciphertext, sharing one process pool between key lengths.
+
+    processes=1 runs the restarts here, processes=None uses every CPU. Use it
+    as a context manager so the pool is closed.
+    """
+
+    def __init__(self, ciphertext, language='fr', scorer=None, frequencies=None, processes=1, sweeps=100, seed=0,
+                 instrument=None):
+        self.instrument = instrument or NULL
+        self.encoded = encode(ciphertext)
+        self.letters = self.encoded.letters.astype(np.int64)
+        tables = anneal_tables(scorer or get_scorer(language), frequencies or LANGUAGE_FREQUENCIES[language])
+        args = (self.letters, tables, seed, sweeps)
+        self.processes = processes or os.cpu_count()
+        if self.processes == 1:
+            _init_worker(*args)
+            self.pool = None
+        else:
+            self.pool = multiprocessing.Pool(self.processes, _init_worker, args)
+
+    def solve(self, key_length, restarts=32, agree=3, time_budget=10.0):
+        """(key, plaintext, score) of the best restart for a key length, see anneal_vigenere."""
+        if len(self.letters) < key_length:
+            raise ValueError("the ciphertext has fewer letters than the key")
+        # horloge monotone: un changement d'heure ne coupe ni ne prolonge la recherche
+        deadline = time.monotonic() + time_budget
+        tasks = [(key_length, index, deadline) for index in range(restarts)]
+        results = map(_restart, tasks) if self.pool is None else self._waves(tasks)
+        (score, shifts), done = _best_of(results, agree, deadline)
+
+        key = ''.join(chr(ord('a') + s) for s in shifts)
+        self.instrument.count('restarts', done)
+        self.instrument.message("Annealing, key length {}: {} restarts, key {}, score {:.2f}",
+                                key_length, done, key, score)
+        return key, self.encoded.decrypt(key), score
+
+    def _waves(self, tasks):
+        # une relance par worker a la fois, dans l'ordre: l'arret anticipe ne depend pas de la vitesse
+        # des workers et ne laisse rien en file pour la longueur suivante
+        for start in range(0, len(tasks), self.processes):
+            yield from self.pool.map(_restart, tasks[start:start + self.processes])
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def anneal_vigenere(ciphertext, key_length, language='fr', scorer=None, frequencies=None, restarts=32,
+                    agree=3, processes=1, time_budget=10.0, sweeps=100, seed=0, instrument=None):
+    """Vigenère key of a given length by simulated annealing under an n-gram score.
+
+    Independent restarts run here, or in a process pool of `processes`
+    workers (None: every CPU); restart i is seeded from (seed, key_length, i).
+    The search stops once `agree` restarts found the best key or after
+    time_budget seconds. N-grams are read on the letters only, as Vigenère
+    ignores the rest. Returns (key, plaintext, score) with plaintext as
+    vigenere_decrypt gives it.
+    """
+    with Annealer(ciphertext, language, scorer, frequencies, processes, sweeps, seed, instrument) as annealer:
+        return annealer.solve(key_length, restarts, agree, time_budget)
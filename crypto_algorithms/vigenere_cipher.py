@@ -0,0 +1,201 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EncodedText:
+    """Text lowered and encoded once: letter indices (uint8) plus the mask of the letter positions."""
+
+    def __init__(self, text):
+        lowered = text.lower()
+        codes = np.frombuffer(lowered.encode('utf-32-le'), dtype=np.uint32)
+
+        mask = (codes >= ord('a')) & (codes <= ord('z'))
+        self.ascii = None  # None: toutes les lettres sont a-z, sinon le masque des lettres a-z parmi les lettres
+        others = np.unique(codes[codes > 127])
+        if len(others):
+            # lettres non ascii (é, ß...): isalpha() comme dans la boucle d'origine
+            alpha = [c for c in others.tolist() if chr(c).isalpha()]
+            if alpha:
+                ascii_mask = mask
+                mask = mask | np.isin(codes, alpha)
+                self.ascii = ascii_mask[mask]
+
+        self.length = len(codes)
+        self.mask = mask
+        self.letters = ((codes[mask].astype(np.int64) - ord('a')) % 26).astype(np.uint8)
+
+    def key_shifts(self, key, phase=0):
+        """Shift of every letter position: the key tiled over the letters only, starting at key[phase]."""
+        if not key:
+            raise ValueError("key must not be empty")
+        shifts = np.array([(ord(k) - ord('a')) % 26 for k in key], dtype=np.uint8)
+        return np.resize(np.roll(shifts, -phase), len(self.letters))
+
+    def encrypt_letters(self, key, phase=0):
+        return (self.letters + self.key_shifts(key, phase)) % 26
+
+    def decrypt_letters(self, key, phase=0):
+        return (self.letters + 26 - self.key_shifts(key, phase)) % 26
+
+    def to_text(self, letters):
+        """Put letters back at their positions, every non-letter becomes a space."""
+        out = np.full(self.length, ord(' '), dtype=np.uint8)
+        out[self.mask] = letters + ord('a')
+        return out.tobytes().decode('ascii')
+
+    def encrypt(self, key):
+        return self.to_text(self.encrypt_letters(key))
+
+    def decrypt(self, key):
+        return self.to_text(self.decrypt_letters(key))
+
+
+def encode(text):
+    """EncodedText of a text, the object itself if it already is one (a Ciphertext for instance)."""
+    return text if isinstance(text, EncodedText) else EncodedText(text)
+
+
+def vigenere_encrypt(plain, key):
+    # le texte est encodé une fois, le décalage se fait en une seule opération mod 26
+    return EncodedText(plain).encrypt(key)
+
+
+def vigenere_decrypt(cipher, key):
+    return EncodedText(cipher).decrypt(key)
+
+
+def vigenere_decrypt_many(cipher, keys):
+    """Decrypt one ciphertext (str or EncodedText) with many keys, encoding it only once."""
+    cipher = encode(cipher)
+    return [cipher.decrypt(key) for key in keys]
+
+
+def minimal_period(key):
+    """Shortest key with the same Vigenère effect: 'clecle' -> 'cle' (letters taken mod 26 like key_shifts)."""
+    shifts = [(ord(k) - ord('a')) % 26 for k in key]
+    n = len(shifts)
+    for period in range(1, n):
+        if n % period == 0 and shifts == shifts[:period] * (n // period):
+            shifts = shifts[:period]
+            break
+    return ''.join(chr(s + ord('a')) for s in shifts)
+
+
+class DecryptCache:
+    """Bounded LRU cache of the decryptions of one ciphertext and of their scores.
+
+    Entries are keyed on the minimal period of the key, so a key repeated
+    ('clecle' for 'cle') or written with other letters for the same shifts
+    is decrypted and scored only once.
+    """
+
+    def __init__(self, cipher, score_fn=None, maxsize=256):
+        self.encoded = encode(cipher)
+        self.score_fn = score_fn
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # cle reduite -> [texte clair, score ou None]
+        self.hits = 0
+        self.misses = 0
+        self.score_calls = 0
+
+    def _entry(self, key):
+        key = minimal_period(key)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self.entries[key] = [self.encoded.decrypt(key), None]
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+    def decrypt(self, key):
+        return self._entry(key)[0]
+
+    def score(self, key):
+        """(plaintext, score) of a key, the score is computed once per entry."""
+        entry = self._entry(key)
+        if entry[1] is None:
+            self.score_calls += 1
+            entry[1] = self.score_fn(entry[0])
+        return entry[0], entry[1]
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'score_calls': self.score_calls, 'size': len(self.entries)}
+
+
+def decrypt_cache(cache, cipher, score_fn=None):
+    """cache if it was built for cipher (and score_fn when given), a new DecryptCache when cache is None.
+
+    The entries are keyed on the key only: a cache of another text or scorer
+    would give wrong plaintexts or scores, so it raises ValueError.
+    """
+    if cache is None:
+        return DecryptCache(cipher, score_fn)
+    encoded = encode(cipher)
+    # deux textes qui ne different que par les non-lettres se dechiffrent pareil
+    if encoded is not cache.encoded and not (np.array_equal(encoded.mask, cache.encoded.mask)
+                                             and np.array_equal(encoded.letters, cache.encoded.letters)):
+        raise ValueError("the cache was built for another ciphertext")
+    if score_fn is not None and cache.score_fn is not score_fn:
+        raise ValueError("the cache scores with another function than the scorer")
+    return cache
+
+
+def _vigenere_stream(key, chunks, decrypt):
+    phase = 0
+    for chunk in chunks:
+        encoded = EncodedText(chunk)
+        if decrypt:
+            letters = encoded.decrypt_letters(key, phase)
+        else:
+            letters = encoded.encrypt_letters(key, phase)
+        # la position dans la clé continue au chunk suivant
+        phase = (phase + len(letters)) % len(key)
+        yield encoded.to_text(letters)
+
+
+def vigenere_encrypt_stream(key, chunks):
+    """Encrypt an iterable of text chunks lazily, the output matches vigenere_encrypt on the joined text."""
+    return _vigenere_stream(key, chunks, decrypt=False)
+
+
+def vigenere_decrypt_stream(key, chunks):
+    """Decrypt an iterable of text chunks lazily, the output matches vigenere_decrypt on the joined text."""
+    return _vigenere_stream(key, chunks, decrypt=True)
+
+
+def vigenere_file(key, src_path, dst_path, decrypt=False, block_size=1 << 20):
+    """Encrypt (or decrypt) a text file block by block."""
+    with open(src_path, encoding='utf-8', errors='replace', newline='') as src, \
+            open(dst_path, 'w', encoding='ascii', newline='') as dst:
+        blocks = iter(lambda: src.read(block_size), '')
+        for out in _vigenere_stream(key, blocks, decrypt):
+            dst.write(out)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vigenère file encryption")
+    parser.add_argument('mode', choices=['enc', 'dec'])
+    parser.add_argument('--key', required=True)
+    parser.add_argument('--block-size', type=int, default=1 << 20)
+    parser.add_argument('input')
+    parser.add_argument('output')
+    args = parser.parse_args(argv)
+
+    vigenere_file(args.key, args.input, args.output, args.mode == 'dec', args.block_size)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        main()
+    else:
+        result = vigenere_decrypt("MAXSMWJOERYVDLVGYVUUESFHNEEHYVTEEHCHMPFILJBRRBNLSLRGYFVRZHYGFSGFIFFSJIMFSYGHIJSAGVCTVEJIHHHEJHCROEWTCFBCVRYVDLVGJHSMVHXHHEESLHSDZGNUJBLSLHUSKCWNFRCSMFMEJRYPBNZSLHTETILLTEVZOWJLZGUWJOERYPPDLZYVEEJSWXSIKSGDUEIWYOTRVBZRSCVQYWUEXSMWJOESHSSOKSAHBNKZYVDLVGWROTISFHTATQYVOOEOOWPRZGYVVNVPIQOEXSMWJOERYVDLVGYVUCIIWLBLVDIXSMRWHWFNZFFDTETILLUEUSMVZSKSGHTCIMJWPGIOJKJQLSMFBRLBYFMETCGSSODWMHQELHYQURRWHHSDVGPLPLRHCROSUSXRONVSMVJGEWZLDAKWPHT", "baroud")
+        print(result)
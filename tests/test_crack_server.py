@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+from crypto_algorithms.caesar_cipher import caesar_encrypt
+from crypto_algorithms.crack_server import CrackServer
+
+
+async def _half_closed_client(port, jobs):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for job in jobs:
+        writer.write((json.dumps(job) + '\n').encode('utf-8'))
+    # plus rien a envoyer: le client ferme son cote et attend les reponses
+    writer.write_eof()
+    answers = [json.loads(await asyncio.wait_for(reader.readline(), 60)) for _ in jobs]
+    assert await reader.readline() == b''
+    writer.close()
+    return answers
+
+
+async def _run(jobs):
+    server = CrackServer(workers=1)
+    try:
+        listener = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+        async with listener:
+            port = listener.sockets[0].getsockname()[1]
+            return await _half_closed_client(port, jobs)
+    finally:
+        server.close()
+
+
+def test_half_closed_client_gets_its_answers():
+    plaintext = "the quick brown fox jumps over the lazy dog while the cat sleeps in the sun"
+    jobs = [{'id': i, 'cipher_type': 'caesar', 'language': 'en', 'ciphertext': caesar_encrypt(plaintext, shift)}
+            for i, shift in enumerate((3, 11))]
+
+    answers = asyncio.run(_run(jobs))
+
+    assert sorted(answer['id'] for answer in answers) == [0, 1]
+    for answer in answers:
+        assert answer['plaintext'] == plaintext
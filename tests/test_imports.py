@@ -0,0 +1,5 @@
+from crypto_algorithms.check_imports import check
+
+
+def test_imports_do_no_work():
+    assert check() == []
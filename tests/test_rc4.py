@@ -0,0 +1,64 @@
+import tracemalloc
+from array import array
+
+import pytest
+
+from crypto_algorithms.RC4 import RC4, RC4_file, RC4_inplace, RC4_into
+
+
+def test_known_vector():
+    assert RC4(b'Key', b'Plaintext').hex() == 'bbf316e8d940af0ad3'
+
+
+def test_buffer_inputs():
+    expected = RC4(b'secret', b'attack at dawn')
+    for data in (b'attack at dawn', bytearray(b'attack at dawn'), memoryview(b'attack at dawn'),
+                 array('B', b'attack at dawn')):
+        assert RC4(b'secret', data) == expected
+
+
+def test_inplace_memoryview_of_bytearray():
+    buf = bytearray(b'#' * 8 + b'attack at dawn' + b'#' * 8)
+    view = memoryview(buf)[8:22]
+
+    result = RC4_inplace(b'secret', view)
+
+    assert result is view
+    assert buf[8:22] == RC4(b'secret', b'attack at dawn')
+    assert buf[:8] == b'#' * 8 and buf[22:] == b'#' * 8
+
+
+def test_inplace_allocates_no_buffer():
+    size = 1 << 16
+    buf = bytearray(size + 16)
+    view = memoryview(buf)[8:8 + size]
+    expected = RC4(b'secret', bytes(size))
+
+    tracemalloc.start()
+    try:
+        RC4_inplace(b'secret', view)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # la table S et quelques entiers, rien de la taille du message
+    assert peak < size // 4
+    assert view == expected
+
+
+def test_into_caller_buffer():
+    dst = bytearray(20)
+    view = memoryview(dst)[2:16]
+
+    assert RC4_into(b'secret', b'attack at dawn', view) is view
+    assert dst[2:16] == RC4(b'secret', b'attack at dawn')
+    assert dst[:2] == bytes(2) and dst[16:] == bytes(4)
+
+
+def test_file_rejects_empty_chunks(tmp_path):
+    src = tmp_path / 'plain'
+    src.write_bytes(b'attack at dawn')
+
+    with pytest.raises(ValueError):
+        RC4_file(b'secret', src, tmp_path / 'cipher', chunk_size=0)
+    assert not (tmp_path / 'cipher').exists()
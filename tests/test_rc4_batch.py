@@ -0,0 +1,16 @@
+import numpy as np
+
+from crypto_algorithms.RC4 import KSA, PRGA
+from crypto_algorithms.rc4_batch import batch_keystream
+
+
+def test_batch_keystream_matches_prga():
+    rng = np.random.default_rng(0)
+    for key_length in (1, 2, 5, 16, 32, 33, 64, 256):
+        keys = rng.integers(0, 256, size=(8, key_length), dtype=np.uint8)
+
+        keystream = batch_keystream(keys, 300)
+
+        assert keystream.shape == (8, 300)
+        for key, row in zip(keys.tolist(), keystream.tolist()):
+            assert row == PRGA(KSA(key), 300)